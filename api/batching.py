@@ -0,0 +1,82 @@
+"""Micro-batching of quote requests across concurrent callers."""
+
+import asyncio
+from typing import Awaitable, Callable
+
+# fetch_batch(http, symbols, detail_flag) -> (quotes, messages)
+FetchBatch = Callable[..., Awaitable[tuple[list[dict], list[dict]]]]
+
+
+def quote_symbol(quote) -> str | None:
+    """Upper-cased Product/symbol of a QuoteData dict, or None if it has none."""
+    product = quote.get("Product") if isinstance(quote, dict) else None
+    symbol = product.get("symbol") if isinstance(product, dict) else None
+    return symbol.upper() if isinstance(symbol, str) else None
+
+
+class QuoteBatcher:
+    """
+    Coalesce quote requests arriving within a short window into one call.
+
+    The first caller for a detail flag opens a batch and schedules its
+    flush; callers arriving before the window closes add their symbols to
+    the same batch. A symbol already pending is shared, not re-requested.
+    Each caller gets back its own symbols plus the Messages of the
+    batches it took part in.
+    """
+
+    def __init__(self, fetch_batch: FetchBatch, window: float):
+        """Batch upstream calls made through fetch_batch over window seconds."""
+        self._fetch_batch = fetch_batch
+        self._window = window
+        self._pending: dict[str, dict[str, asyncio.Future]] = {}
+        self._flushes: set[asyncio.Task] = set()
+
+    async def get(
+        self, http, symbols: list[str], detail_flag: str
+    ) -> tuple[dict[str, dict], list[dict]]:
+        """Return ({symbol: quote}, messages) for symbols, batched."""
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(detail_flag)
+        if batch is None:
+            batch = self._pending[detail_flag] = {}
+            flush = loop.create_task(self._flush(http, detail_flag))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+        futures = []
+        for symbol in symbols:
+            if symbol not in batch:
+                batch[symbol] = loop.create_future()
+            futures.append(batch[symbol])
+
+        results = await asyncio.gather(*(asyncio.shield(f) for f in futures))
+
+        quotes = {}
+        messages = {}
+        for symbol, (quote, batch_messages) in zip(symbols, results):
+            if quote is not None:
+                quotes[symbol] = quote
+            messages[id(batch_messages)] = batch_messages
+        return quotes, [m for batch_messages in messages.values() for m in batch_messages]
+
+    async def _flush(self, http, detail_flag: str) -> None:
+        """Close the batch after the window and resolve every waiting symbol."""
+        await asyncio.sleep(self._window)
+        batch = self._pending.pop(detail_flag)
+        try:
+            quotes, messages = await self._fetch_batch(http, list(batch), detail_flag)
+            by_symbol = {}
+            for quote in quotes:
+                symbol = quote_symbol(quote)
+                if symbol:
+                    by_symbol[symbol] = quote
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for symbol, future in batch.items():
+            if not future.done():
+                future.set_result((by_symbol.get(symbol), messages))
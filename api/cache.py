@@ -0,0 +1,89 @@
+"""Async-aware TTL cache for upstream E*TRADE responses."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from cachetools import TTLCache
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into one in-flight task.
+
+    Callers arriving while a task for their key is running await that
+    task's result (or exception) instead of starting their own. The task
+    is shielded, so one caller being cancelled does not cancel it for the
+    others.
+    """
+
+    def __init__(self):
+        """Start with nothing in flight."""
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        """True while a task for key is running."""
+        return key in self._inflight
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Await fetch() for key, sharing a task that is already running."""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fetch())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+
+class AsyncTTLCache:
+    """
+    TTL cache whose misses are filled by an awaitable, one fetch per key.
+
+    Concurrent misses for the same key share a single upstream fetch via
+    SingleFlight instead of each going upstream.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """Create a cache holding up to maxsize entries for ttl seconds."""
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+
+    async def get_or_fetch(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached value for key, awaiting fetch() on a miss."""
+        try:
+            value = self._cache[key]
+            self.hits += 1
+            return value
+        except KeyError:
+            pass
+
+        if self._flight.in_flight(key):
+            self.shared += 1
+        else:
+            self.misses += 1
+
+        async def fill():
+            value = await fetch()
+            self._cache[key] = value
+            return value
+
+        return await self._flight.do(key, fill)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss/shared-fetch counters and current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+            "size": len(self._cache),
+            "maxsize": self._cache.maxsize,
+            "ttl": self._cache.ttl,
+        }
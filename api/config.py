@@ -1,8 +1,8 @@
 """Configuration management using Pydantic settings."""
 
+from functools import cached_property, lru_cache
 from pathlib import Path
-from pydantic import ConfigDict
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Get project root directory (where .env lives)
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -12,7 +12,12 @@ ENV_FILE = PROJECT_ROOT / ".env"
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
-    model_config = ConfigDict(env_file=str(ENV_FILE), case_sensitive=False)
+    model_config = SettingsConfigDict(
+        env_file=str(ENV_FILE),
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+    )
 
     # E*TRADE OAuth - Sandbox
     etrade_consumer_key_sandbox: str = ""
@@ -26,6 +31,7 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     api_debug: bool = True
+    api_workers: int = 1
 
     # Sandbox Mode
     etrade_sandbox: bool = True
@@ -37,28 +43,47 @@ class Settings(BaseSettings):
 
     # Logging
     log_level: str = "INFO"
+    log_access: bool = False
 
-    @property
+    # Derived values are computed once on first access; settings are
+    # immutable for the life of the process.
+    @cached_property
     def consumer_key(self) -> str:
         """Get appropriate consumer key based on sandbox mode."""
         if self.etrade_sandbox:
             return self.etrade_consumer_key_sandbox
         return self.etrade_consumer_key_prod
 
-    @property
+    @cached_property
     def consumer_secret(self) -> str:
         """Get appropriate consumer secret based on sandbox mode."""
         if self.etrade_sandbox:
             return self.etrade_consumer_secret_sandbox
         return self.etrade_consumer_secret_prod
 
-    @property
-    def etrade_base_url(self) -> str:
-        """Get E*TRADE base URL based on sandbox mode."""
+    @cached_property
+    def etrade_host(self) -> str:
+        """Get E*TRADE API host URL based on sandbox mode."""
         if self.etrade_sandbox:
-            return "https://apisb.etrade.com/v1"
-        return "https://api.etrade.com/v1"
+            return "https://apisb.etrade.com"
+        return "https://api.etrade.com"
+
+    @cached_property
+    def etrade_base_url(self) -> str:
+        """Get E*TRADE REST API base URL based on sandbox mode."""
+        return f"{self.etrade_host}/v1"
+
+    @cached_property
+    def etrade_oauth_url(self) -> str:
+        """Get E*TRADE OAuth endpoint base URL based on sandbox mode."""
+        return f"{self.etrade_host}/oauth"
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, parsing env/.env only once."""
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
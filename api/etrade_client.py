@@ -1,9 +1,13 @@
 """E*TRADE client wrapper using pyetrade."""
 
 import logging
-from pyetrade import ETradeOAuth, ETradeAccounts, ETradeMarket, ETradeOrder
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING
 from api.config import settings
 
+if TYPE_CHECKING:
+    from pyetrade import ETradeOAuth, ETradeAccounts, ETradeMarket, ETradeOrder
+
 logger = logging.getLogger(__name__)
 
 
@@ -12,82 +16,66 @@ class ETradeAPIClient:
 
     def __init__(self):
         """Initialize E*TRADE client."""
-        # Initialize OAuth manager (no resource owner keys yet - pre-auth)
-        self.oauth = ETradeOAuth(
+        # pyetrade handles are built lazily on first use; most requests
+        # only ever touch one of them.
+        logger.info(
+            f"E*TRADE client initialized (sandbox={settings.etrade_sandbox})"
+        )
+
+    @cached_property
+    def oauth(self) -> "ETradeOAuth":
+        """OAuth manager (no resource owner keys yet - pre-auth)."""
+        from pyetrade import ETradeOAuth
+
+        return ETradeOAuth(
             consumer_key=settings.consumer_key,
             consumer_secret=settings.consumer_secret,
         )
-        
-        # Initialize API modules with placeholder tokens (pre-auth)
-        # These will be updated with actual tokens after OAuth flow
-        self.accounts = ETradeAccounts(
+
+    # API modules use placeholder tokens (pre-auth); these will be
+    # updated with actual tokens after OAuth flow
+
+    @cached_property
+    def accounts(self) -> "ETradeAccounts":
+        """Accounts API module."""
+        from pyetrade import ETradeAccounts
+
+        return ETradeAccounts(
             client_key=settings.consumer_key,
             client_secret=settings.consumer_secret,
             resource_owner_key="",
             resource_owner_secret="",
             dev=settings.etrade_sandbox,
         )
-        
-        self.market = ETradeMarket(
+
+    @cached_property
+    def market(self) -> "ETradeMarket":
+        """Market API module."""
+        from pyetrade import ETradeMarket
+
+        return ETradeMarket(
             client_key=settings.consumer_key,
             client_secret=settings.consumer_secret,
             resource_owner_key="",
             resource_owner_secret="",
             dev=settings.etrade_sandbox,
         )
-        
-        self.order = ETradeOrder(
+
+    @cached_property
+    def order(self) -> "ETradeOrder":
+        """Order API module."""
+        from pyetrade import ETradeOrder
+
+        return ETradeOrder(
             client_key=settings.consumer_key,
             client_secret=settings.consumer_secret,
             resource_owner_key="",
             resource_owner_secret="",
             dev=settings.etrade_sandbox,
         )
-        
-        logger.info(
-            f"E*TRADE client initialized (sandbox={settings.etrade_sandbox})"
-        )
 
-    async def get_accounts(self):
-        """Get list of accounts."""
-        try:
-            logger.info("Fetching accounts from E*TRADE API")
-            # Placeholder - will implement actual API call in Phase 2
-            return {"accounts": []}
-        except Exception as e:
-            logger.error(f"Error fetching accounts: {e}")
-            raise
-
-    async def get_account_balance(self, account_id_key: str):
-        """Get account balance."""
-        try:
-            logger.info(f"Fetching balance for account: {account_id_key}")
-            # Placeholder - will implement actual API call in Phase 2
-            return {"balance": 0}
-        except Exception as e:
-            logger.error(f"Error fetching balance: {e}")
-            raise
-
-    async def get_portfolio(self, account_id_key: str):
-        """Get portfolio positions."""
-        try:
-            logger.info(f"Fetching portfolio for account: {account_id_key}")
-            # Placeholder - will implement actual API call in Phase 2
-            return {"positions": []}
-        except Exception as e:
-            logger.error(f"Error fetching portfolio: {e}")
-            raise
-
-    async def get_quote(self, symbols: str):
-        """Get stock quotes."""
-        try:
-            logger.info(f"Fetching quotes for symbols: {symbols}")
-            # Placeholder - will implement actual API call in Phase 2
-            return {"quotes": []}
-        except Exception as e:
-            logger.error(f"Error fetching quotes: {e}")
-            raise
-
-
-# Global client instance
-etrade_client = ETradeAPIClient()
+
+@lru_cache(maxsize=1)
+def get_etrade_client() -> ETradeAPIClient:
+    """Return the process-wide client, constructing it on first use."""
+    return ETradeAPIClient()
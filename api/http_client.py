@@ -0,0 +1,61 @@
+"""Async HTTP client for E*TRADE API calls."""
+
+import httpx
+from oauthlib.oauth1 import Client as OAuth1Client
+
+from api.config import settings
+from api.oauth import oauth_manager
+
+# Connection pool for the shared client. HTTP/2 multiplexes every
+# concurrent request to E*TRADE's single host over one connection, so the
+# pool only needs headroom for an HTTP/1.1 fallback. Idle connections are
+# kept for KEEPALIVE_EXPIRY seconds so polling clients skip TCP + TLS setup.
+MAX_CONNECTIONS = 16
+MAX_KEEPALIVE_CONNECTIONS = 4
+KEEPALIVE_EXPIRY = 85.0
+CONNECT_RETRIES = 3
+TIMEOUT_SECONDS = 10.0
+CONNECT_TIMEOUT_SECONDS = 3.0
+
+
+class OAuth1Auth(httpx.Auth):
+    """Sign each request with the OAuth manager's current access token."""
+
+    def __init__(self, manager):
+        """Sign on behalf of manager; tokens are read at request time."""
+        self.manager = manager
+
+    def auth_flow(self, request: httpx.Request):
+        client = OAuth1Client(
+            settings.consumer_key,
+            client_secret=settings.consumer_secret,
+            resource_owner_key=self.manager.access_token,
+            resource_owner_secret=self.manager.access_token_secret,
+            signature_type="AUTH_HEADER",
+        )
+        # Only form bodies are signed under OAuth 1.0a, so the body is
+        # never passed; query parameters are taken from the URL.
+        _, headers, _ = client.sign(str(request.url), http_method=request.method)
+        request.headers["Authorization"] = headers["Authorization"]
+        response = yield request
+        # A rejected token must be re-checked before the next call
+        if response.status_code == 401:
+            self.manager.invalidate_auth_check()
+
+
+def create_async_client() -> httpx.AsyncClient:
+    """Create a pooled, HTTP/2-capable client signed with OAuth 1.0a."""
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=CONNECT_RETRIES,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+    )
+    return httpx.AsyncClient(
+        auth=OAuth1Auth(oauth_manager),
+        transport=transport,
+        timeout=httpx.Timeout(TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS),
+    )
@@ -1,23 +1,345 @@
 """FastAPI application for E*TRADE Local API."""
 
+import asyncio
+import hashlib
 import logging
-from fastapi import FastAPI
+from contextlib import asynccontextmanager, suppress
+from operator import itemgetter
+from cachetools import LRUCache, TTLCache
+import httpx
+from fastapi import Depends, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+import orjson
+from lxml import etree
+from api.batching import QuoteBatcher
+from api.cache import AsyncTTLCache
 from api.config import settings
+from api.http_client import create_async_client
 from api.oauth import oauth_manager
-from api.etrade_client import etrade_client
+from api.orders import build_cancel_body, build_order_body, normalize_order, validate_order
+from api.parsers import (
+    PositionsFeed,
+    parse_accounts_xml,
+    parse_balance_xml,
+    parse_cash_xml,
+    parse_lookup_xml,
+    parse_option_chains_xml,
+    parse_option_expire_dates_xml,
+    parse_position_summaries_xml,
+    parse_positions_xml,
+    parse_quotes_xml,
+)
+from api.responses import ORJSONResponse
 
 # Configure logging
 logging.basicConfig(level=settings.log_level)
 logger = logging.getLogger(__name__)
 
+# E*TRADE API root for the configured environment (sandbox or production)
+BASE_URL = settings.etrade_base_url
+
+# Endpoint URL templates, resolved against BASE_URL once at import
+URLS = {
+    "accounts_list": f"{BASE_URL}/accounts/list",
+    "balance": f"{BASE_URL}/accounts/{{key}}/balance",
+    "portfolio": f"{BASE_URL}/accounts/{{key}}/portfolio",
+    "quote": f"{BASE_URL}/market/quote/{{symbols}}",
+    "lookup": f"{BASE_URL}/market/lookup/{{search}}",
+    "option_chains": f"{BASE_URL}/market/optionchains",
+    "option_expire_dates": f"{BASE_URL}/market/optionexpiredate",
+    "orders": f"{BASE_URL}/accounts/{{key}}/orders",
+    "orders_preview": f"{BASE_URL}/accounts/{{key}}/orders/preview",
+    "orders_place": f"{BASE_URL}/accounts/{{key}}/orders/place",
+    "orders_cancel": f"{BASE_URL}/accounts/{{key}}/orders/cancel",
+}
+
+# Position columns summed into the /summary totals
+MARKET_VALUE = itemgetter("marketValue")
+GAIN = itemgetter("gain")
+
+# Query string for the per-account real-time balance fetched by the
+# aggregate endpoints; shared rather than rebuilt for every account
+BALANCE_PARAMS = {"instType": "BROKERAGE", "realTimeNAV": "true"}
+
+# Constant payloads, built once rather than per request. /health and
+# /config are polled by monitors, so their bodies are pre-serialized.
+HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "etrade-local-api",
+    "version": "0.1.0",
+})
+CONFIG_BODY = orjson.dumps({
+    "sandbox_mode": settings.etrade_sandbox,
+    "api_host": settings.api_host,
+    "api_port": settings.api_port,
+    "mcp_enabled": settings.mcp_enabled,
+    "etrade_base_url": settings.etrade_base_url,
+})
+
+# Symbol lookups and the account list change rarely (the account list is
+# also dropped whenever the login changes); quotes are cached just long
+# enough to absorb bursty polling
+LOOKUP_CACHE_TTL = 300
+ACCOUNTS_CACHE_TTL = 3600
+QUOTE_CACHE_TTL = 2
+QUOTE_BATCH_WINDOW = 0.02
+
+# E*TRADE answers at most this many symbols per quote call
+QUOTE_MAX_SYMBOLS = 25
+
+# Read size for upstream bodies parsed while they stream in
+STREAM_CHUNK_SIZE = 64 * 1024
+lookup_cache = AsyncTTLCache(maxsize=1024, ttl=LOOKUP_CACHE_TTL)
+accounts_cache = AsyncTTLCache(maxsize=8, ttl=ACCOUNTS_CACHE_TTL)
+quote_cache = TTLCache(maxsize=4096, ttl=QUOTE_CACHE_TTL)
+
+# Last ETag and body E*TRADE sent per request, so a repeat fetch can be
+# revalidated with If-None-Match instead of downloaded again
+upstream_validators = LRUCache(maxsize=256)
+
+
+def is_ok(response) -> bool:
+    """True for a 200 response; False for other statuses or a gathered exception."""
+    if isinstance(response, Exception):
+        logger.warning("Upstream request failed: %s", response)
+        return False
+    return response.status_code == 200
+
+
+def ndjson_response(lines) -> StreamingResponse:
+    """
+    Stream an async iterator of dicts as NDJSON, one orjson line each.
+    
+    Headers are already sent once streaming starts, so a failure midway
+    is reported as a final {"status": "error"} line.
+    """
+    async def encode():
+        try:
+            async for line in lines:
+                yield orjson.dumps(line) + b"\n"
+        except Exception as e:
+            logger.error("Error streaming response: %s", e)
+            yield orjson.dumps({"status": "error", "error": str(e)}) + b"\n"
+    
+    return StreamingResponse(encode(), media_type="application/x-ndjson")
+
+
+def body_etag(content: bytes) -> str:
+    """Strong ETag for an upstream body (BLAKE2b, 128-bit)."""
+    return f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the client's If-None-Match already names etag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return any(
+        tag.strip().removeprefix("W/") in (etag, "*")
+        for tag in if_none_match.split(",")
+    )
+
+
+def accepts_encoding(accept_encoding: str | None, encoding: str) -> bool:
+    """
+    True if an Accept-Encoding header value allows encoding.
+    
+    q=0 refuses it, as does a q-value that is not a number.
+    """
+    for entry in (accept_encoding or "").split(","):
+        coding, _, params = entry.partition(";")
+        if coding.strip().lower() not in (encoding.lower(), "*"):
+            continue
+        quality = params.strip().removeprefix("q=").strip()
+        if not quality:
+            return True
+        try:
+            return float(quality) > 0
+        except ValueError:
+            return False
+    return False
+
+
+async def stream_upstream(
+    http, method: str, url: str, accept_encoding: str = None, **kwargs
+) -> StreamingResponse:
+    """
+    Relay an E*TRADE response body as it arrives, without buffering it.
+
+    accept_encoding is the caller's Accept-Encoding and is sent upstream
+    in place of the client's default (identity when the caller sent
+    none). A body in an encoding the caller accepts is forwarded raw
+    with its Content-Encoding, so nothing is decoded or re-encoded on the
+    way through; anything else is decoded first. An error status raises,
+    for the app's httpx handlers to report.
+    """
+    headers = {**kwargs.pop("headers", {}), "Accept-Encoding": accept_encoding or "identity"}
+    request = http.build_request(method, url, headers=headers, **kwargs)
+    response = await http.send(request, stream=True)
+    if response.is_error:
+        await response.aread()
+        await response.aclose()
+        response.raise_for_status()
+
+    encoding = response.headers.get("Content-Encoding")
+    if encoding and accepts_encoding(accept_encoding, encoding):
+        body = response.aiter_raw()
+        headers = {"Content-Encoding": encoding}
+    else:
+        body = response.aiter_bytes()
+        headers = {}
+    return StreamingResponse(
+        body,
+        status_code=response.status_code,
+        media_type=response.headers.get("Content-Type", "application/xml"),
+        headers=headers,
+        background=BackgroundTask(response.aclose),
+    )
+
+
+# Pre-rendered body for requests made before the OAuth flow has completed
+NOT_AUTHENTICATED_BODY = orjson.dumps({
+    "status": "error",
+    "error": "Not authenticated. Call /oauth/request-token first.",
+})
+
+
+class NotAuthenticatedError(Exception):
+    """Raised by require_auth when no usable access token is available."""
+
+
+async def require_auth() -> None:
+    """Route dependency gating E*TRADE endpoints on a valid OAuth session."""
+    if not await oauth_manager.ensure_authenticated_cached():
+        raise NotAuthenticatedError()
+
+
+# Route dependencies for every endpoint that calls E*TRADE
+REQUIRES_AUTH = [Depends(require_auth)]
+
+
+async def revalidating_get(http, url: str, params: dict = None) -> bytes:
+    """
+    GET url, sending If-None-Match when a previous body carried an ETag.
+    
+    A 304 reuses the stored body, so E*TRADE sends no body at all when
+    nothing changed.
+    """
+    key = (url, tuple(sorted(params.items())) if params else ())
+    stored = upstream_validators.get(key)
+    headers = {"If-None-Match": stored[0]} if stored else None
+    
+    response = await http.get(url, params=params, headers=headers)
+    if stored and response.status_code == 304:
+        return stored[1]
+    response.raise_for_status()
+    
+    if "ETag" in response.headers:
+        upstream_validators[key] = (response.headers["ETag"], response.content)
+    return response.content
+
+
+async def cached_get(cache: AsyncTTLCache, http, url: str, params: dict = None) -> bytes:
+    """GET url through cache, keyed by URL and params; only 2xx bodies are stored."""
+    key = (url, tuple(sorted(params.items())) if params else ())
+    return await cache.get_or_fetch(key, lambda: revalidating_get(http, url, params))
+
+
+async def fetch_accounts(http) -> list[dict]:
+    """Fetch and parse the account list, served from accounts_cache when fresh."""
+    return parse_accounts_xml(
+        await cached_get(accounts_cache, http, URLS["accounts_list"])
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own the shared E*TRADE HTTP client and token refresher for the life of the app."""
+    app.state.http = create_async_client()
+    refresh = asyncio.create_task(oauth_manager.refresh_loop())
+    try:
+        yield
+    finally:
+        refresh.cancel()
+        with suppress(asyncio.CancelledError):
+            await refresh
+        await app.state.http.aclose()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="E*TRADE Local API",
     description="Local REST API wrapper for E*TRADE with MCP integration",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
+
+@app.exception_handler(NotAuthenticatedError)
+async def not_authenticated_handler(request: Request, exc: NotAuthenticatedError):
+    """Answer unauthenticated calls with 401 and the standard error envelope."""
+    return Response(NOT_AUTHENTICATED_BODY, status_code=401, media_type="application/json")
+
+
+@app.exception_handler(httpx.HTTPStatusError)
+async def upstream_status_handler(request: Request, exc: httpx.HTTPStatusError):
+    """
+    Relay an E*TRADE error status: 4xx as-is, 5xx as 502 Bad Gateway.
+    
+    A 401 means the token was revoked, so the account list cached under
+    it is dropped too.
+    """
+    upstream = exc.response
+    if upstream.status_code == 401:
+        accounts_cache.clear()
+    logger.error("E*TRADE returned %s for %s", upstream.status_code, request.url.path)
+    return ORJSONResponse(
+        {
+            "status": "error",
+            "error": f"E*TRADE returned {upstream.status_code} {upstream.reason_phrase}",
+        },
+        status_code=upstream.status_code if upstream.status_code < 500 else 502,
+    )
+
+
+@app.exception_handler(httpx.RequestError)
+async def upstream_unreachable_handler(request: Request, exc: httpx.RequestError):
+    """Report a failed E*TRADE call as 504 on timeout, otherwise 502."""
+    logger.error("E*TRADE request failed for %s: %r", request.url.path, exc)
+    return ORJSONResponse(
+        {"status": "error", "error": f"E*TRADE request failed: {exc!r}"},
+        status_code=504 if isinstance(exc, httpx.TimeoutException) else 502,
+    )
+
+
+@app.exception_handler(etree.XMLSyntaxError)
+async def upstream_unparseable_handler(request: Request, exc: etree.XMLSyntaxError):
+    """Report an E*TRADE body that is not well-formed XML as 502."""
+    logger.error("Unparseable E*TRADE response for %s: %s", request.url.path, exc)
+    return ORJSONResponse(
+        {"status": "error", "error": f"E*TRADE returned an unparseable response: {exc}"},
+        status_code=502,
+    )
+
+
+@app.exception_handler(Exception)
+async def unexpected_error_handler(request: Request, exc: Exception):
+    """Answer any other failure with 500 and the standard error envelope."""
+    logger.error("Error handling %s: %s", request.url.path, exc)
+    return ORJSONResponse({"status": "error", "error": str(exc)}, status_code=500)
+
+
+def invalid_order_response(order: dict) -> ORJSONResponse | None:
+    """A 422 error envelope if validate_order rejects order, otherwise None."""
+    error = validate_order(order)
+    if error is None:
+        return None
+    return ORJSONResponse({"status": "error", "error": error}, status_code=422)
+
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -31,33 +353,22 @@ app.add_middleware(
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "service": "etrade-local-api",
-        "version": "0.1.0",
-    }
+    return Response(HEALTH_BODY, media_type="application/json")
 
 
 @app.get("/config")
 async def config_status():
     """Get current configuration status."""
-    return {
-        "sandbox_mode": settings.etrade_sandbox,
-        "api_host": settings.api_host,
-        "api_port": settings.api_port,
-        "mcp_enabled": settings.mcp_enabled,
-        "etrade_base_url": settings.etrade_base_url,
-    }
+    return Response(CONFIG_BODY, media_type="application/json")
 
 
-@app.get("/docs")
-async def documentation():
-    """API documentation endpoint."""
-    return {
-        "swagger_ui": "/docs",
-        "openapi_schema": "/openapi.json",
-        "redoc": "/redoc",
-    }
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters for the upstream response caches."""
+    return ORJSONResponse({
+        "accounts": accounts_cache.stats(),
+        "lookup": lookup_cache.stats(),
+    })
 
 
 @app.get("/auth/status")
@@ -68,20 +379,20 @@ async def auth_status():
     Returns whether tokens are valid and when they expire.
     """
     if not oauth_manager.is_authenticated():
-        return {
+        return ORJSONResponse({
             "authenticated": False,
             "message": "Not authenticated. Call /oauth/request-token to start.",
-        }
+        })
     
-    # Check if tokens can be used
-    can_use = oauth_manager.ensure_authenticated()
+    # Check if tokens can be used (cached, and run off the event loop)
+    can_use = await oauth_manager.ensure_authenticated_cached()
     
-    return {
+    return ORJSONResponse({
         "authenticated": can_use,
         "token_date": oauth_manager.token_date,
         "last_used": oauth_manager.last_used.isoformat() if oauth_manager.last_used else None,
         "message": "Ready" if can_use else "Tokens expired, re-authentication required",
-    }
+    })
 
 
 @app.get("/oauth/request-token")
@@ -92,19 +403,19 @@ async def oauth_request_token():
     Returns authorization URL for user to visit.
     """
     try:
-        token_data = oauth_manager.get_request_token()
-        return {
+        token_data = await asyncio.to_thread(oauth_manager.get_request_token)
+        return ORJSONResponse({
             "oauth_token": token_data["oauth_token"],
             "oauth_token_secret": token_data["oauth_token_secret"],
             "authorization_url": token_data["authorization_url"],
             "status": "success",
-        }
+        })
     except Exception as e:
-        logger.error(f"OAuth request token error: {e}")
-        return {
+        logger.error("OAuth request token error: %s", e)
+        return ORJSONResponse({
             "status": "error",
             "error": str(e),
-        }
+        })
 
 
 @app.get("/oauth/callback")
@@ -117,75 +428,63 @@ async def oauth_callback(oauth_token: str, oauth_verifier: str):
     """
     try:
         if not oauth_verifier:
-            return {
+            return ORJSONResponse({
                 "status": "error",
                 "error": "oauth_verifier is required",
-            }
+            })
         
-        logger.info(f"OAuth callback received with verifier: {oauth_verifier}")
+        logger.info("OAuth callback received with verifier: %s", oauth_verifier)
         
         # Set the verifier
         oauth_manager.set_oauth_verifier(oauth_verifier)
         
         # Exchange for access token
-        access_token_data = oauth_manager.get_access_token()
+        access_token_data = await asyncio.to_thread(oauth_manager.get_access_token)
+        accounts_cache.clear()
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "message": "OAuth authentication complete",
             "oauth_token": access_token_data["oauth_token"],
             "oauth_token_secret": access_token_data["oauth_token_secret"],
-        }
+        })
     except Exception as e:
-        logger.error(f"OAuth callback error: {e}")
-        return {
+        logger.error("OAuth callback error: %s", e)
+        return ORJSONResponse({
             "status": "error",
             "error": str(e),
-        }
+        })
 
 
-@app.get("/accounts")
-async def get_accounts():
+@app.get("/accounts", dependencies=REQUIRES_AUTH)
+async def get_accounts(request: Request):
     """
     Get list of accounts for authenticated user.
     
     Requires: Valid OAuth access token
     Returns: List of accounts with IDs and balances
     """
-    try:
-        if not oauth_manager.ensure_authenticated():
-            return {
-                "status": "error",
-                "error": "Not authenticated. Call /oauth/request-token first.",
-            }
-        
-        logger.info("Fetching accounts from E*TRADE")
-        
-        # Use authenticated session directly
-        if settings.etrade_sandbox:
-            url = "https://apisb.etrade.com/v1/accounts/list"
-        else:
-            url = "https://api.etrade.com/v1/accounts/list"
-        
-        response = oauth_manager.session.get(url)
-        response.raise_for_status()
-        
-        logger.info(f"Got accounts response")
-        
-        return {
-            "status": "success",
-            "accounts": response.text,
-        }
-    except Exception as e:
-        logger.error(f"Error fetching accounts: {e}")
-        return {
-            "status": "error",
-            "error": str(e),
-        }
+    logger.info("Fetching accounts from E*TRADE")
+    
+    content = await cached_get(
+        accounts_cache, request.app.state.http, URLS["accounts_list"]
+    )
+    
+    logger.info("Got accounts response")
+    
+    # Unchanged upstream body: skip parsing and serialization entirely
+    etag = body_etag(content)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    return ORJSONResponse({
+        "status": "success",
+        "accounts": parse_accounts_xml(content),
+    }, headers={"ETag": etag})
 
 
-@app.get("/accounts/{account_id_key}/balance")
-async def get_balance(account_id_key: str, real_time: bool = True):
+@app.get("/accounts/{account_id_key}/balance", dependencies=REQUIRES_AUTH)
+async def get_balance(request: Request, account_id_key: str, real_time: bool = True):
     """
     Get account balance.
     
@@ -195,356 +494,221 @@ async def get_balance(account_id_key: str, real_time: bool = True):
     
     Returns: Cash available, buying power, etc.
     """
-    try:
-        if not oauth_manager.ensure_authenticated():
-            return {
-                "status": "error",
-                "error": "Not authenticated. Call /oauth/request-token first.",
-            }
-        
-        logger.info(f"Fetching balance for account: {account_id_key}")
-        
-        if settings.etrade_sandbox:
-            url = f"https://apisb.etrade.com/v1/accounts/{account_id_key}/balance"
-        else:
-            url = f"https://api.etrade.com/v1/accounts/{account_id_key}/balance"
-        
-        params = {
-            "instType": "BROKERAGE",
-            "realTimeNAV": str(real_time).lower(),
-        }
-        
-        response = oauth_manager.session.get(url, params=params)
-        response.raise_for_status()
-        
-        return {
-            "status": "success",
-            "balance": response.text,
-        }
-    except Exception as e:
-        logger.error(f"Error fetching balance: {e}")
-        return {
-            "status": "error",
-            "error": str(e),
-        }
+    logger.info("Fetching balance for account: %s", account_id_key)
+    
+    url = URLS["balance"].format(key=account_id_key)
+    
+    params = {
+        "instType": "BROKERAGE",
+        "realTimeNAV": str(real_time).lower(),
+    }
+    
+    response = await request.app.state.http.get(url, params=params)
+    response.raise_for_status()
+    
+    return ORJSONResponse({
+        "status": "success",
+        "balance": parse_balance_xml(response.content),
+    })
 
 
-@app.get("/accounts/{account_id_key}/portfolio")
-async def get_portfolio(account_id_key: str):
+@app.get("/accounts/{account_id_key}/portfolio", dependencies=REQUIRES_AUTH)
+async def get_portfolio(request: Request, account_id_key: str):
     """
     Get portfolio positions for a specific account.
     
     Args:
         account_id_key: The accountIdKey from /accounts endpoint
     
-    Returns: List of positions with symbol, quantity, market value, gain/loss
+    Returns: Every position with all of its E*TRADE fields
     """
-    try:
-        if not oauth_manager.ensure_authenticated():
-            return {
-                "status": "error",
-                "error": "Not authenticated. Call /oauth/request-token first.",
-            }
-        
-        logger.info(f"Fetching portfolio for account: {account_id_key}")
-        
-        # Build URL for E*TRADE portfolio API
-        if settings.etrade_sandbox:
-            url = f"https://apisb.etrade.com/v1/accounts/{account_id_key}/portfolio"
-        else:
-            url = f"https://api.etrade.com/v1/accounts/{account_id_key}/portfolio"
-        
-        # Use authenticated session
-        response = oauth_manager.session.get(url)
-        response.raise_for_status()
-        
-        logger.info(f"Got portfolio response")
-        
-        return {
-            "status": "success",
-            "portfolio": response.text,
-        }
-    except Exception as e:
-        logger.error(f"Error fetching portfolio: {e}")
-        return {
-            "status": "error",
-            "error": str(e),
-        }
+    logger.info("Fetching portfolio for account: %s", account_id_key)
+    
+    url = URLS["portfolio"].format(key=account_id_key)
+    content = await revalidating_get(request.app.state.http, url)
+    
+    logger.info("Got portfolio response")
+    
+    etag = body_etag(content)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    return ORJSONResponse({
+        "status": "success",
+        "positions": parse_positions_xml(content),
+    }, headers={"ETag": etag})
 
 
-@app.get("/balances")
-async def get_all_balances():
+@app.get("/balances", dependencies=REQUIRES_AUTH)
+async def get_all_balances(request: Request):
     """
     Get balances for ALL accounts.
     
-    Returns each account with its balance info.
+    Streams NDJSON: a header line with the account count, then one line
+    per account with its balance info, in completion order.
     """
-    import xml.etree.ElementTree as ET
+    logger.info("Fetching all balances...")
+    http = request.app.state.http
+    accounts = await fetch_accounts(http)
     
-    try:
-        if not oauth_manager.ensure_authenticated():
-            return {
-                "status": "error",
-                "error": "Not authenticated. Call /oauth/request-token first.",
-            }
-        
-        logger.info("Fetching all balances...")
-        if settings.etrade_sandbox:
-            accounts_url = "https://apisb.etrade.com/v1/accounts/list"
-            base_url = "https://apisb.etrade.com/v1"
-        else:
-            accounts_url = "https://api.etrade.com/v1/accounts/list"
-            base_url = "https://api.etrade.com/v1"
-        
-        accounts_response = oauth_manager.session.get(accounts_url)
-        accounts_response.raise_for_status()
-        
-        root = ET.fromstring(accounts_response.text)
-        accounts = []
-        for account in root.findall('.//Account'):
-            accounts.append({
-                "accountIdKey": account.find('accountIdKey').text,
-                "accountDesc": account.find('accountDesc').text,
-                "accountType": account.find('accountType').text,
-            })
-        
-        logger.info(f"Found {len(accounts)} accounts")
-        
-        balances = []
-        for account in accounts:
-            account_id_key = account["accountIdKey"]
-            logger.info(f"Fetching balance for {account['accountDesc']}...")
-            
-            balance_url = f"{base_url}/accounts/{account_id_key}/balance"
-            balance_response = oauth_manager.session.get(
-                balance_url, 
-                params={"instType": "BROKERAGE", "realTimeNAV": "true"}
+    logger.info("Found %s accounts", len(accounts))
+    
+    # One failed request is reported against its account, not the whole call
+    async def fetch_balance(account):
+        logger.info("Fetching balance for %s...", account['accountDesc'])
+        try:
+            balance_response = await http.get(
+                URLS["balance"].format(key=account["accountIdKey"]),
+                params=BALANCE_PARAMS,
             )
-            
-            if balance_response.status_code == 200:
-                balances.append({
-                    "account": account,
-                    "balance": balance_response.text,
-                })
-            else:
-                balances.append({
-                    "account": account,
-                    "balance": None,
-                    "error": f"Status {balance_response.status_code}",
-                })
+        except Exception as e:
+            return {"account": account, "balance": None, "error": str(e)}
         
+        if balance_response.status_code != 200:
+            return {
+                "account": account,
+                "balance": None,
+                "error": f"Status {balance_response.status_code}",
+            }
         return {
-            "status": "success",
-            "account_count": len(accounts),
-            "balances": balances,
-        }
-    except Exception as e:
-        logger.error(f"Error fetching balances: {e}")
-        return {
-            "status": "error",
-            "error": str(e),
+            "account": account,
+            "balance": parse_balance_xml(balance_response.content),
         }
+    
+    async def lines():
+        yield {"status": "success", "account_count": len(accounts)}
+        for next_line in asyncio.as_completed([
+            fetch_balance(account) for account in accounts
+        ]):
+            yield await next_line
+    
+    return ndjson_response(lines())
 
 
-@app.get("/summary")
-async def get_account_summary():
+@app.get("/summary", dependencies=REQUIRES_AUTH)
+async def get_account_summary(request: Request):
     """
     Get comprehensive summary of all accounts with balances and positions.
     
-    Returns parsed JSON with:
-    - Each account's balance (cash, buying power)
-    - Each account's positions (symbol, qty, price, value, gain/loss)
-    - Totals across all accounts
+    Streams NDJSON, starting with a header line:
+    - One line per account with its balance (cash) and positions
+      (symbol, qty, price, value, gain/loss), in completion order; an
+      account whose bodies cannot be parsed gets an "error" line instead
+      and is left out of the totals
+    - A final {"totals": ...} line across all accounts
     """
-    import xml.etree.ElementTree as ET
+    logger.info("Fetching account summary...")
     
-    try:
-        if not oauth_manager.ensure_authenticated():
-            return {
-                "status": "error",
-                "error": "Not authenticated. Call /oauth/request-token first.",
-            }
-        
-        logger.info("Fetching account summary...")
-        if settings.etrade_sandbox:
-            base_url = "https://apisb.etrade.com/v1"
-        else:
-            base_url = "https://api.etrade.com/v1"
-        
-        # Get accounts
-        accounts_response = oauth_manager.session.get(f"{base_url}/accounts/list")
-        accounts_response.raise_for_status()
-        root = ET.fromstring(accounts_response.text)
-        
-        accounts_data = []
-        total_cash = 0
-        total_portfolio = 0
-        total_gain = 0
+    # Get accounts
+    http = request.app.state.http
+    accounts = await fetch_accounts(http)
+    
+    # Balance and portfolio are fetched together; a failed request is
+    # treated like a non-200 response
+    async def fetch_account(account_info):
+        key = account_info["accountIdKey"]
+        bal_resp, port_resp = await asyncio.gather(
+            http.get(URLS["balance"].format(key=key), params=BALANCE_PARAMS),
+            http.get(URLS["portfolio"].format(key=key)),
+            return_exceptions=True,
+        )
         
-        for account in root.findall('.//Account'):
-            account_id_key = account.find('accountIdKey').text
-            account_info = {
-                "accountIdKey": account_id_key,
-                "accountDesc": account.find('accountDesc').text,
-                "accountType": account.find('accountType').text,
-            }
-            
-            # Get balance
-            bal_resp = oauth_manager.session.get(
-                f"{base_url}/accounts/{account_id_key}/balance",
-                params={"instType": "BROKERAGE", "realTimeNAV": "true"}
+        # Portfolio bodies can be large; parse off the event loop so other
+        # requests keep being served (lxml releases the GIL while parsing).
+        # A body that fails to parse is reported against its account only
+        try:
+            cash = parse_cash_xml(bal_resp.content) if is_ok(bal_resp) else 0
+            positions = (
+                await asyncio.to_thread(parse_position_summaries_xml, port_resp.content)
+                if is_ok(port_resp) else []
             )
-            
-            cash = 0
-            if bal_resp.status_code == 200:
-                bal_root = ET.fromstring(bal_resp.text)
-                cash_elem = bal_root.find('.//cashAvailableForInvestment')
-                cash = float(cash_elem.text) if cash_elem is not None else 0
-            
-            # Get positions
-            port_resp = oauth_manager.session.get(f"{base_url}/accounts/{account_id_key}/portfolio")
-            
-            positions = []
-            portfolio_value = 0
-            account_gain = 0
-            
-            if port_resp.status_code == 200:
-                port_root = ET.fromstring(port_resp.text)
-                for p in port_root.findall('.//Position'):
-                    symbol = p.find('.//symbol').text
-                    qty = float(p.find('quantity').text)
-                    price_elem = p.find('.//lastTrade')
-                    price = float(price_elem.text) if price_elem is not None else 0
-                    value = float(p.find('marketValue').text)
-                    gain = float(p.find('totalGain').text)
-                    gain_pct = float(p.find('totalGainPct').text)
-                    
-                    positions.append({
-                        "symbol": symbol,
-                        "quantity": qty,
-                        "price": price,
-                        "marketValue": value,
-                        "gain": gain,
-                        "gainPct": gain_pct,
-                    })
-                    portfolio_value += value
-                    account_gain += gain
-            
-            accounts_data.append({
-                "account": account_info,
-                "cash": cash,
-                "portfolioValue": portfolio_value,
-                "totalValue": cash + portfolio_value,
-                "totalGain": account_gain,
-                "positions": positions,
-            })
-            
-            total_cash += cash
-            total_portfolio += portfolio_value
-            total_gain += account_gain
+        except Exception as e:
+            logger.warning("Could not parse summary for %s: %s", key, e)
+            return {"account": account_info, "error": str(e)}
+        portfolio_value = sum(map(MARKET_VALUE, positions))
         
         return {
-            "status": "success",
-            "accounts": accounts_data,
-            "totals": {
-                "cash": total_cash,
-                "portfolioValue": total_portfolio,
-                "totalValue": total_cash + total_portfolio,
-                "totalGain": total_gain,
-            },
-        }
-    except Exception as e:
-        logger.error(f"Error fetching summary: {e}")
-        return {
-            "status": "error",
-            "error": str(e),
+            "account": account_info,
+            "cash": cash,
+            "portfolioValue": portfolio_value,
+            "totalValue": cash + portfolio_value,
+            "totalGain": sum(map(GAIN, positions)),
+            "positions": positions,
         }
+    
+    async def lines():
+        yield {"status": "success", "account_count": len(accounts)}
+        
+        totals = {"cash": 0, "portfolioValue": 0, "totalValue": 0, "totalGain": 0}
+        for next_line in asyncio.as_completed([
+            fetch_account(account) for account in accounts
+        ]):
+            account_data = await next_line
+            if "error" not in account_data:
+                for key in totals:
+                    totals[key] += account_data[key]
+            yield account_data
+        
+        yield {"totals": totals}
+    
+    return ndjson_response(lines())
 
 
-@app.get("/portfolios")
-async def get_all_portfolios():
+@app.get("/portfolios", dependencies=REQUIRES_AUTH)
+async def get_all_portfolios(request: Request):
     """
     Get portfolios for ALL accounts.
     
     Fetches account list, then retrieves portfolio for each account.
-    Returns combined results.
+    Streams NDJSON: a header line with the account count, then one line
+    per account in completion order.
     """
-    import xml.etree.ElementTree as ET
+    # Step 1: Get all accounts
+    logger.info("Fetching all accounts...")
+    http = request.app.state.http
+    accounts = await fetch_accounts(http)
     
-    try:
-        if not oauth_manager.ensure_authenticated():
-            return {
-                "status": "error",
-                "error": "Not authenticated. Call /oauth/request-token first.",
-            }
-        
-        # Step 1: Get all accounts
-        logger.info("Fetching all accounts...")
-        if settings.etrade_sandbox:
-            accounts_url = "https://apisb.etrade.com/v1/accounts/list"
-            base_url = "https://apisb.etrade.com/v1"
-        else:
-            accounts_url = "https://api.etrade.com/v1/accounts/list"
-            base_url = "https://api.etrade.com/v1"
-        
-        accounts_response = oauth_manager.session.get(accounts_url)
-        accounts_response.raise_for_status()
-        
-        # Parse accounts XML to get accountIdKeys
-        root = ET.fromstring(accounts_response.text)
-        accounts = []
-        for account in root.findall('.//Account'):
-            account_id_key = account.find('accountIdKey').text
-            account_desc = account.find('accountDesc').text
-            account_type = account.find('accountType').text
-            accounts.append({
-                "accountIdKey": account_id_key,
-                "accountDesc": account_desc,
-                "accountType": account_type,
-            })
-        
-        logger.info(f"Found {len(accounts)} accounts")
-        
-        # Step 2: Get portfolio for each account
-        portfolios = []
-        for account in accounts:
-            account_id_key = account["accountIdKey"]
-            logger.info(f"Fetching portfolio for {account['accountDesc']}...")
-            
-            portfolio_url = f"{base_url}/accounts/{account_id_key}/portfolio"
-            portfolio_response = oauth_manager.session.get(portfolio_url)
-            
-            if portfolio_response.status_code == 200:
-                portfolios.append({
-                    "account": account,
-                    "portfolio": portfolio_response.text,
-                })
-            else:
-                portfolios.append({
-                    "account": account,
-                    "portfolio": None,
-                    "error": f"Status {portfolio_response.status_code}",
-                })
-        
-        return {
-            "status": "success",
-            "account_count": len(accounts),
-            "portfolios": portfolios,
-        }
-    except Exception as e:
-        logger.error(f"Error fetching portfolios: {e}")
-        return {
-            "status": "error",
-            "error": str(e),
-        }
+    logger.info("Found %s accounts", len(accounts))
+    
+    # Step 2: Get portfolio for each account, concurrently; one failed
+    # request is reported against its account, not the whole call
+    async def fetch_portfolio(account):
+        logger.info("Fetching portfolio for %s...", account['accountDesc'])
+        portfolio_url = URLS["portfolio"].format(key=account["accountIdKey"])
+        try:
+            async with http.stream("GET", portfolio_url) as portfolio_response:
+                if portfolio_response.status_code != 200:
+                    return {
+                        "account": account,
+                        "portfolio": None,
+                        "error": f"Status {portfolio_response.status_code}",
+                    }
+                # Positions are parsed as the body arrives, so no account's
+                # full XML is ever buffered
+                feed = PositionsFeed()
+                async for chunk in portfolio_response.aiter_bytes(STREAM_CHUNK_SIZE):
+                    feed.feed(chunk)
+                return {"account": account, "portfolio": feed.close()}
+        except Exception as e:
+            return {"account": account, "portfolio": None, "error": str(e)}
+    
+    # One line per account as each portfolio completes
+    async def lines():
+        yield {"status": "success", "account_count": len(accounts)}
+        for next_line in asyncio.as_completed([
+            fetch_portfolio(account) for account in accounts
+        ]):
+            yield await next_line
+    
+    return ndjson_response(lines())
 
 
 # =============================================================================
 # Market API Endpoints
 # =============================================================================
 
-@app.get("/market/quote/{symbols}")
-async def get_quotes(symbols: str, detail_flag: str = "ALL"):
+@app.get("/market/quote/{symbols}", dependencies=REQUIRES_AUTH)
+async def get_quotes(request: Request, symbols: str, detail_flag: str = "ALL"):
     """
     Get stock quotes for one or more symbols.
     
@@ -554,76 +718,107 @@ async def get_quotes(symbols: str, detail_flag: str = "ALL"):
     
     Returns: Quote data including price, bid/ask, volume, etc.
     """
-    try:
-        if not oauth_manager.ensure_authenticated():
-            return {
-                "status": "error",
-                "error": "Not authenticated. Call /oauth/request-token first.",
-            }
-        
-        logger.info(f"Fetching quotes for: {symbols}")
-        
-        if settings.etrade_sandbox:
-            url = f"https://apisb.etrade.com/v1/market/quote/{symbols}"
-        else:
-            url = f"https://api.etrade.com/v1/market/quote/{symbols}"
-        
-        response = oauth_manager.session.get(url, params={"detailFlag": detail_flag})
-        response.raise_for_status()
-        
-        return {
-            "status": "success",
-            "quotes": response.text,
-        }
-    except Exception as e:
-        logger.error(f"Error fetching quotes: {e}")
-        return {
-            "status": "error",
-            "error": str(e),
-        }
+    quotes, messages = await fetch_quotes(
+        request.app.state.http, symbols, detail_flag
+    )
+    return ORJSONResponse({
+        "status": "success",
+        "quotes": quotes,
+        "messages": messages,
+    })
+
+
+async def fetch_quotes(http, symbols: str, detail_flag: str) -> tuple[list[dict], list[dict]]:
+    """
+    Return (quotes, messages), fetching only symbols not in quote_cache.
+    
+    Cache misses go through quote_batcher, so misses from concurrent
+    callers within QUOTE_BATCH_WINDOW share one upstream call; each
+    returned QuoteData is cached per (symbol, detail_flag). Messages
+    from that call (e.g. invalid symbols) are passed through.
+    
+    Option requests bypass the cache and batcher: E*TRADE reports the
+    underlier in Product/symbol, so their quotes cannot be matched back
+    to the requested option key.
+    """
+    requested = list(dict.fromkeys(
+        symbol.strip().upper() for symbol in symbols.split(",") if symbol.strip()
+    ))
+    if detail_flag.upper() == "OPTIONS" or any(":" in s for s in requested):
+        return await fetch_quote_batch(http, requested, detail_flag)
+    # One cache read per symbol, so an entry expiring midway still counts
+    # as missing rather than dropping out of the response
+    found = {s: quote_cache.get((s, detail_flag)) for s in requested}
+    missing = [s for s in requested if found[s] is None]
+    messages = []
+    if missing:
+        fetched, messages = await quote_batcher.get(http, missing, detail_flag)
+        for symbol, quote in fetched.items():
+            quote_cache[(symbol, detail_flag)] = quote
+            found[symbol] = quote
+    
+    quotes = [found[s] for s in requested if found.get(s) is not None]
+    return quotes, messages
+
+
+async def fetch_quote_batch(http, symbols: list[str], detail_flag: str) -> tuple[list[dict], list[dict]]:
+    """
+    Fetch one batch of symbols from E*TRADE.
+    
+    Batches over QUOTE_MAX_SYMBOLS are split into concurrent calls whose
+    quotes and messages are concatenated in symbol order.
+    """
+    results = await asyncio.gather(*(
+        fetch_quote_chunk(http, symbols[i:i + QUOTE_MAX_SYMBOLS], detail_flag)
+        for i in range(0, len(symbols), QUOTE_MAX_SYMBOLS)
+    ))
+    quotes = [quote for chunk_quotes, _ in results for quote in chunk_quotes]
+    messages = [message for _, chunk_messages in results for message in chunk_messages]
+    return quotes, messages
+
+
+async def fetch_quote_chunk(http, symbols: list[str], detail_flag: str) -> tuple[list[dict], list[dict]]:
+    """Fetch up to QUOTE_MAX_SYMBOLS symbols in a single quote call."""
+    logger.info("Fetching quotes for: %s", ','.join(symbols))
+    
+    url = URLS["quote"].format(symbols=",".join(symbols))
+    response = await http.get(url, params={"detailFlag": detail_flag})
+    response.raise_for_status()
+    return parse_quotes_xml(response.content)
+
+
+quote_batcher = QuoteBatcher(fetch_quote_batch, window=QUOTE_BATCH_WINDOW)
 
 
-@app.get("/market/lookup/{search}")
-async def lookup_symbol(search: str):
+@app.get("/market/lookup/{search}", dependencies=REQUIRES_AUTH)
+async def lookup_symbol(request: Request, search: str):
     """
     Look up securities by name or partial symbol.
     
     Args:
         search: Search term (e.g., "apple", "micro")
     
-    Returns: List of matching securities with symbols.
+    Returns: List of matching securities (symbol, description, type).
     """
-    try:
-        if not oauth_manager.ensure_authenticated():
-            return {
-                "status": "error",
-                "error": "Not authenticated. Call /oauth/request-token first.",
-            }
-        
-        logger.info(f"Looking up: {search}")
-        
-        if settings.etrade_sandbox:
-            url = f"https://apisb.etrade.com/v1/market/lookup/{search}"
-        else:
-            url = f"https://api.etrade.com/v1/market/lookup/{search}"
-        
-        response = oauth_manager.session.get(url)
-        response.raise_for_status()
-        
-        return {
-            "status": "success",
-            "results": response.text,
-        }
-    except Exception as e:
-        logger.error(f"Error looking up symbol: {e}")
-        return {
-            "status": "error",
-            "error": str(e),
-        }
+    logger.info("Looking up: %s", search)
+    
+    content = await cached_get(
+        lookup_cache, request.app.state.http, URLS["lookup"].format(search=search)
+    )
+    
+    etag = body_etag(content)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    return ORJSONResponse({
+        "status": "success",
+        "results": parse_lookup_xml(content),
+    }, headers={"ETag": etag})
 
 
-@app.get("/market/optionchains")
+@app.get("/market/optionchains", dependencies=REQUIRES_AUTH)
 async def get_option_chains(
+    request: Request,
     symbol: str,
     expiry_year: int = None,
     expiry_month: int = None,
@@ -641,95 +836,70 @@ async def get_option_chains(
         strike_price_near: Center strike price
         no_of_strikes: Number of strikes to return
         chain_type: CALL, PUT, or CALLPUT
+    
+    Returns: The chain's near price and selected expiry, plus one
+    OptionPair (Call and/or Put) per strike.
     """
-    try:
-        if not oauth_manager.ensure_authenticated():
-            return {
-                "status": "error",
-                "error": "Not authenticated. Call /oauth/request-token first.",
-            }
-        
-        logger.info(f"Fetching option chains for: {symbol}")
-        
-        if settings.etrade_sandbox:
-            url = "https://apisb.etrade.com/v1/market/optionchains"
-        else:
-            url = "https://api.etrade.com/v1/market/optionchains"
-        
-        params = {"symbol": symbol, "chainType": chain_type}
-        if expiry_year:
-            params["expiryYear"] = expiry_year
-        if expiry_month:
-            params["expiryMonth"] = expiry_month
-        if expiry_day:
-            params["expiryDay"] = expiry_day
-        if strike_price_near:
-            params["strikePriceNear"] = strike_price_near
-        if no_of_strikes:
-            params["noOfStrikes"] = no_of_strikes
-        
-        response = oauth_manager.session.get(url, params=params)
-        response.raise_for_status()
-        
-        return {
-            "status": "success",
-            "optionChains": response.text,
-        }
-    except Exception as e:
-        logger.error(f"Error fetching option chains: {e}")
-        return {
-            "status": "error",
-            "error": str(e),
-        }
+    logger.info("Fetching option chains for: %s", symbol)
+    
+    url = URLS["option_chains"]
+    
+    params = {"symbol": symbol, "chainType": chain_type}
+    if expiry_year:
+        params["expiryYear"] = expiry_year
+    if expiry_month:
+        params["expiryMonth"] = expiry_month
+    if expiry_day:
+        params["expiryDay"] = expiry_day
+    if strike_price_near:
+        params["strikePriceNear"] = strike_price_near
+    if no_of_strikes:
+        params["noOfStrikes"] = no_of_strikes
+    
+    response = await request.app.state.http.get(url, params=params)
+    response.raise_for_status()
+    
+    # Chains with many strikes are large; parse off the event loop
+    return ORJSONResponse({
+        "status": "success",
+        "optionChain": await asyncio.to_thread(parse_option_chains_xml, response.content),
+    })
 
 
-@app.get("/market/optionexpiredate")
-async def get_option_expiry_dates(symbol: str, expiry_type: str = "ALL"):
+@app.get("/market/optionexpiredate", dependencies=REQUIRES_AUTH)
+async def get_option_expiry_dates(request: Request, symbol: str, expiry_type: str = "ALL"):
     """
     Get option expiry dates for a symbol.
     
     Args:
         symbol: Underlying symbol (required)
         expiry_type: ALL, WEEKLY, MONTHLY, QUARTERLY
+    
+    Returns: List of expiration dates (year, month, day, expiryType).
     """
-    try:
-        if not oauth_manager.ensure_authenticated():
-            return {
-                "status": "error",
-                "error": "Not authenticated. Call /oauth/request-token first.",
-            }
-        
-        logger.info(f"Fetching option expiry dates for: {symbol}")
-        
-        if settings.etrade_sandbox:
-            url = "https://apisb.etrade.com/v1/market/optionexpiredate"
-        else:
-            url = "https://api.etrade.com/v1/market/optionexpiredate"
-        
-        response = oauth_manager.session.get(url, params={
-            "symbol": symbol,
-            "expiryType": expiry_type,
-        })
-        response.raise_for_status()
-        
-        return {
-            "status": "success",
-            "expiryDates": response.text,
-        }
-    except Exception as e:
-        logger.error(f"Error fetching option expiry dates: {e}")
-        return {
-            "status": "error",
-            "error": str(e),
-        }
+    logger.info("Fetching option expiry dates for: %s", symbol)
+    
+    url = URLS["option_expire_dates"]
+    
+    response = await request.app.state.http.get(url, params={
+        "symbol": symbol,
+        "expiryType": expiry_type,
+    })
+    response.raise_for_status()
+    
+    return ORJSONResponse({
+        "status": "success",
+        "expirationDates": parse_option_expire_dates_xml(response.content),
+    })
 
 
 # =============================================================================
 # Orders API Endpoints
 # =============================================================================
 
-@app.get("/orders/{account_id_key}")
+@app.get("/orders/{account_id_key}", dependencies=REQUIRES_AUTH)
 async def list_orders(
+    request: Request,
     account_id_key: str,
     status: str = None,
     from_date: str = None,
@@ -747,38 +917,31 @@ async def list_orders(
         symbol: Filter by symbol
         count: Number of orders to return
     """
-    try:
-        if not oauth_manager.ensure_authenticated():
-            return {"status": "error", "error": "Not authenticated."}
-        
-        logger.info(f"Fetching orders for account: {account_id_key}")
-        
-        if settings.etrade_sandbox:
-            url = f"https://apisb.etrade.com/v1/accounts/{account_id_key}/orders"
-        else:
-            url = f"https://api.etrade.com/v1/accounts/{account_id_key}/orders"
-        
-        params = {"count": count}
-        if status:
-            params["status"] = status
-        if from_date:
-            params["fromDate"] = from_date
-        if to_date:
-            params["toDate"] = to_date
-        if symbol:
-            params["symbol"] = symbol
-        
-        response = oauth_manager.session.get(url, params=params)
-        response.raise_for_status()
-        
-        return {"status": "success", "orders": response.text}
-    except Exception as e:
-        logger.error(f"Error fetching orders: {e}")
-        return {"status": "error", "error": str(e)}
+    logger.info("Fetching orders for account: %s", account_id_key)
+    
+    url = URLS["orders"].format(key=account_id_key)
+    
+    params = {"count": count}
+    if status:
+        params["status"] = status
+    if from_date:
+        params["fromDate"] = from_date
+    if to_date:
+        params["toDate"] = to_date
+    if symbol:
+        params["symbol"] = symbol
+    
+    return await stream_upstream(
+        request.app.state.http,
+        "GET",
+        url,
+        accept_encoding=request.headers.get("accept-encoding"),
+        params=params,
+    )
 
 
-@app.post("/orders/{account_id_key}/preview")
-async def preview_order(account_id_key: str, order: dict):
+@app.post("/orders/{account_id_key}/preview", dependencies=REQUIRES_AUTH)
+async def preview_order(request: Request, account_id_key: str, order: dict):
     """
     Preview an order before placing it.
     
@@ -796,61 +959,27 @@ async def preview_order(account_id_key: str, order: dict):
         "orderTerm": "GOOD_FOR_DAY"
     }
     """
-    try:
-        if not oauth_manager.ensure_authenticated():
-            return {"status": "error", "error": "Not authenticated."}
-        
-        logger.info(f"Previewing order for account: {account_id_key}")
-        
-        if settings.etrade_sandbox:
-            url = f"https://apisb.etrade.com/v1/accounts/{account_id_key}/orders/preview"
-        else:
-            url = f"https://api.etrade.com/v1/accounts/{account_id_key}/orders/preview"
-        
-        # Build E*TRADE order request format
-        etrade_order = {
-            "PreviewOrderRequest": {
-                "orderType": order.get("orderType", "EQ"),
-                "clientOrderId": order.get("clientOrderId", str(int(__import__('time').time()))),
-                "Order": [{
-                    "allOrNone": "false",
-                    "priceType": order.get("priceType", "MARKET"),
-                    "orderTerm": order.get("orderTerm", "GOOD_FOR_DAY"),
-                    "marketSession": order.get("marketSession", "REGULAR"),
-                    "Instrument": [{
-                        "Product": {
-                            "securityType": "EQ",
-                            "symbol": order["symbol"]
-                        },
-                        "orderAction": order["action"],
-                        "quantityType": "QUANTITY",
-                        "quantity": str(order["quantity"])
-                    }]
-                }]
-            }
-        }
-        
-        if order.get("limitPrice"):
-            etrade_order["PreviewOrderRequest"]["Order"][0]["limitPrice"] = str(order["limitPrice"])
-        if order.get("stopPrice"):
-            etrade_order["PreviewOrderRequest"]["Order"][0]["stopPrice"] = str(order["stopPrice"])
-        
-        import json
-        response = oauth_manager.session.post(
-            url,
-            headers={"Content-Type": "application/json"},
-            data=json.dumps(etrade_order)
-        )
-        response.raise_for_status()
-        
-        return {"status": "success", "preview": response.text}
-    except Exception as e:
-        logger.error(f"Error previewing order: {e}")
-        return {"status": "error", "error": str(e)}
+    logger.info("Previewing order for account: %s", account_id_key)
+    
+    order = normalize_order(order)
+    invalid = invalid_order_response(order)
+    if invalid:
+        return invalid
+    
+    url = URLS["orders_preview"].format(key=account_id_key)
+    
+    return await stream_upstream(
+        request.app.state.http,
+        "POST",
+        url,
+        accept_encoding=request.headers.get("accept-encoding"),
+        headers={"Content-Type": "application/json"},
+        content=build_order_body("PreviewOrderRequest", order),
+    )
 
 
-@app.post("/orders/{account_id_key}/place")
-async def place_order(account_id_key: str, order: dict, preview_id: str):
+@app.post("/orders/{account_id_key}/place", dependencies=REQUIRES_AUTH)
+async def place_order(request: Request, account_id_key: str, order: dict, preview_id: str):
     """
     Place an order after previewing.
     
@@ -859,85 +988,40 @@ async def place_order(account_id_key: str, order: dict, preview_id: str):
         order: Same order dict as preview
         preview_id: previewId from preview response
     """
-    try:
-        if not oauth_manager.ensure_authenticated():
-            return {"status": "error", "error": "Not authenticated."}
-        
-        logger.info(f"Placing order for account: {account_id_key}")
-        
-        if settings.etrade_sandbox:
-            url = f"https://apisb.etrade.com/v1/accounts/{account_id_key}/orders/place"
-        else:
-            url = f"https://api.etrade.com/v1/accounts/{account_id_key}/orders/place"
-        
-        etrade_order = {
-            "PlaceOrderRequest": {
-                "orderType": order.get("orderType", "EQ"),
-                "clientOrderId": order.get("clientOrderId", str(int(__import__('time').time()))),
-                "PreviewIds": [{"previewId": preview_id}],
-                "Order": [{
-                    "allOrNone": "false",
-                    "priceType": order.get("priceType", "MARKET"),
-                    "orderTerm": order.get("orderTerm", "GOOD_FOR_DAY"),
-                    "marketSession": order.get("marketSession", "REGULAR"),
-                    "Instrument": [{
-                        "Product": {
-                            "securityType": "EQ",
-                            "symbol": order["symbol"]
-                        },
-                        "orderAction": order["action"],
-                        "quantityType": "QUANTITY",
-                        "quantity": str(order["quantity"])
-                    }]
-                }]
-            }
-        }
-        
-        if order.get("limitPrice"):
-            etrade_order["PlaceOrderRequest"]["Order"][0]["limitPrice"] = str(order["limitPrice"])
-        if order.get("stopPrice"):
-            etrade_order["PlaceOrderRequest"]["Order"][0]["stopPrice"] = str(order["stopPrice"])
-        
-        import json
-        response = oauth_manager.session.post(
-            url,
-            headers={"Content-Type": "application/json"},
-            data=json.dumps(etrade_order)
-        )
-        response.raise_for_status()
-        
-        return {"status": "success", "order": response.text}
-    except Exception as e:
-        logger.error(f"Error placing order: {e}")
-        return {"status": "error", "error": str(e)}
+    logger.info("Placing order for account: %s", account_id_key)
+    
+    order = normalize_order(order)
+    invalid = invalid_order_response(order)
+    if invalid:
+        return invalid
+    
+    url = URLS["orders_place"].format(key=account_id_key)
+    
+    return await stream_upstream(
+        request.app.state.http,
+        "POST",
+        url,
+        accept_encoding=request.headers.get("accept-encoding"),
+        headers={"Content-Type": "application/json"},
+        content=build_order_body("PlaceOrderRequest", order, preview_id),
+    )
 
 
-@app.put("/orders/{account_id_key}/cancel")
-async def cancel_order(account_id_key: str, order_id: str):
+@app.put("/orders/{account_id_key}/cancel", dependencies=REQUIRES_AUTH)
+async def cancel_order(request: Request, account_id_key: str, order_id: str):
     """Cancel an open order."""
-    try:
-        if not oauth_manager.ensure_authenticated():
-            return {"status": "error", "error": "Not authenticated."}
-        
-        logger.info(f"Cancelling order {order_id} for account: {account_id_key}")
-        
-        if settings.etrade_sandbox:
-            url = f"https://apisb.etrade.com/v1/accounts/{account_id_key}/orders/cancel"
-        else:
-            url = f"https://api.etrade.com/v1/accounts/{account_id_key}/orders/cancel"
-        
-        import json
-        response = oauth_manager.session.put(
-            url,
-            headers={"Content-Type": "application/json"},
-            data=json.dumps({"CancelOrderRequest": {"orderId": order_id}})
-        )
-        response.raise_for_status()
-        
-        return {"status": "success", "result": response.text}
-    except Exception as e:
-        logger.error(f"Error cancelling order: {e}")
-        return {"status": "error", "error": str(e)}
+    logger.info("Cancelling order %s for account: %s", order_id, account_id_key)
+    
+    url = URLS["orders_cancel"].format(key=account_id_key)
+    
+    return await stream_upstream(
+        request.app.state.http,
+        "PUT",
+        url,
+        accept_encoding=request.headers.get("accept-encoding"),
+        headers={"Content-Type": "application/json"},
+        content=build_cancel_body(order_id),
+    )
 
 
 if __name__ == "__main__":
@@ -948,4 +1032,6 @@ if __name__ == "__main__":
         host=settings.api_host,
         port=settings.api_port,
         reload=settings.api_debug,
+        workers=settings.api_workers,
+        access_log=settings.log_access,
     )
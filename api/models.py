@@ -1,12 +1,22 @@
 """Pydantic models for API responses and data validation."""
 
-from typing import Optional
+from typing import Annotated, Optional
 from decimal import Decimal
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
+# Bounded decimals are checked by pydantic-core itself, with no Python
+# validator in the loop
+Money = Annotated[Decimal, Field(max_digits=20, decimal_places=4)]
 
-class Account(BaseModel):
+
+class EtradeModel(BaseModel):
+    """Base for the models below; unknown fields are rejected."""
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class Account(EtradeModel):
     """Account information model."""
 
     account_id: str
@@ -17,74 +27,78 @@ class Account(BaseModel):
     account_nickname: Optional[str] = None
 
 
-class Balance(BaseModel):
+class Balance(EtradeModel):
     """Account balance information."""
 
     account_id: str
-    cash_balance: Decimal
-    buying_power: Decimal
-    margin_balance: Decimal
-    equity_value: Decimal
+    cash_balance: Money
+    buying_power: Money
+    margin_balance: Money
+    equity_value: Money
 
 
-class Position(BaseModel):
+class Position(EtradeModel):
     """Stock position model."""
 
     symbol: str
     quantity: int
-    price: Decimal
-    value: Decimal
-    gain_loss: Decimal
-    gain_loss_pct: Decimal
+    price: Money
+    value: Money
+    gain_loss: Money
+    gain_loss_pct: Money
+
+
+# Validates a whole batch of positions in one pydantic-core call
+PositionList = TypeAdapter(list[Position])
 
 
-class Portfolio(BaseModel):
+class Portfolio(EtradeModel):
     """Portfolio summary model."""
 
     account_id: str
     total_positions: int
-    total_value: Decimal
-    cash: Decimal
-    total_gain_loss: Decimal
+    total_value: Money
+    cash: Money
+    total_gain_loss: Money
     positions: list[Position]
 
 
-class Quote(BaseModel):
+class Quote(EtradeModel):
     """Stock quote model."""
 
     symbol: str
-    last_price: Decimal
-    bid: Decimal
-    ask: Decimal
+    last_price: Money
+    bid: Money
+    ask: Money
     volume: int
     timestamp: datetime
 
 
-class OrderPreview(BaseModel):
+class OrderPreview(EtradeModel):
     """Order preview response."""
 
     order_id: str
     order_type: str
     symbol: str
     quantity: int
-    price: Decimal
-    estimated_total: Decimal
-    estimated_commission: Decimal
+    price: Money
+    estimated_total: Money
+    estimated_commission: Money
 
 
-class Order(BaseModel):
+class Order(EtradeModel):
     """Order model."""
 
     order_id: str
     symbol: str
     quantity: int
-    price: Optional[Decimal]
+    price: Optional[Money]
     order_type: str
     status: str
     created_at: datetime
 
 
-class Alert(BaseModel):
+class Alert(EtradeModel):
     """Alert model."""
 
     alert_id: str
@@ -1,14 +1,21 @@
 """OAuth handling for E*TRADE API with token persistence and auto-renewal."""
 
-import json
+import asyncio
+import contextlib
 import logging
 import os
-from datetime import datetime, timedelta
+import tempfile
+import threading
+import time
+from datetime import datetime, time as dt_time, timedelta
 from pathlib import Path
 from typing import Dict, Optional
 from zoneinfo import ZoneInfo
 
+import orjson
+from requests.adapters import HTTPAdapter
 from requests_oauthlib import OAuth1Session
+from urllib3.util.retry import Retry
 from api.config import settings
 
 logger = logging.getLogger(__name__)
@@ -17,6 +24,56 @@ logger = logging.getLogger(__name__)
 TOKEN_FILE = Path.home() / ".etrade_tokens.json"
 EASTERN_TZ = ZoneInfo("America/New_York")
 
+# OAuth endpoints for the configured environment, resolved once at import
+REQUEST_TOKEN_URL = f"{settings.etrade_oauth_url}/request_token"
+ACCESS_TOKEN_URL = f"{settings.etrade_oauth_url}/access_token"
+RENEW_TOKEN_URL = f"{settings.etrade_oauth_url}/renew_access_token"
+AUTHORIZE_URL = "https://us.etrade.com/e/t/etws/authorize"
+
+# Connection pool shared by every call made through the OAuth session
+POOL_CONNECTIONS = 20
+POOL_MAXSIZE = 50
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# How long a successful ensure_authenticated() check is trusted (seconds)
+AUTH_CHECK_TTL = 30
+
+# E*TRADE deactivates tokens left idle this long (seconds). refresh_loop()
+# renews RENEW_AHEAD before that, checking at least every REFRESH_POLL_SECONDS.
+TOKEN_IDLE_LIMIT = 2 * 60 * 60
+RENEW_AHEAD = 5 * 60
+REFRESH_POLL_SECONDS = 60
+
+# Routine ensure_authenticated() checks persist last_used at most this
+# often (seconds); new or renewed tokens are always written straight away
+PERSIST_INTERVAL = 5 * 60
+
+
+def _build_session(**kwargs) -> OAuth1Session:
+    """
+    Create an OAuth1Session with a pooled, retrying HTTPS adapter.
+    
+    Keep-alive connections are reused across calls so the TCP + TLS
+    handshake is paid once, and transient 429/5xx responses are retried.
+    """
+    session = OAuth1Session(
+        settings.consumer_key,
+        settings.consumer_secret,
+        signature_type="AUTH_HEADER",
+        **kwargs,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=RETRY_STATUS_CODES,
+        ),
+    )
+    session.mount("https://", adapter)
+    return session
+
 
 class OAuthManager:
     """Manages OAuth flow with E*TRADE with token persistence and auto-renewal."""
@@ -29,43 +86,103 @@ class OAuthManager:
         self.access_token: Optional[str] = None
         self.access_token_secret: Optional[str] = None
         self.session: Optional[OAuth1Session] = None
-        self.last_used: Optional[datetime] = None
+        self._last_used_epoch = 0.0  # time.time() of the last use, 0 if none
+        self._renewed_at = 0.0  # time.time() of the last successful renewal
         self.token_date: Optional[str] = None  # Date tokens were obtained (ET)
+        self._persisted_at: Optional[float] = None
+        # st_mtime_ns of TOKEN_FILE as last loaded or saved
+        self._tokens_mtime: Optional[int] = None
+        self._eastern_date = ""
+        self._eastern_date_until = 0.0
+        
+        # Cached result of the last successful check (monotonic deadline)
+        self._auth_lock = asyncio.Lock()
+        # Held while renewing, so concurrent threads send one renewal
+        self._renew_lock = threading.Lock()
+        self._auth_valid_until = 0.0
         
         # Try to load saved tokens
         self._load_tokens()
 
+    @property
+    def last_used(self) -> Optional[datetime]:
+        """Time of the last use in Eastern time, or None if never used."""
+        if not self._last_used_epoch:
+            return None
+        return datetime.fromtimestamp(self._last_used_epoch, EASTERN_TZ)
+
     def _get_eastern_date(self) -> str:
-        """Get current date in Eastern timezone as string."""
-        return datetime.now(EASTERN_TZ).strftime("%Y-%m-%d")
+        """
+        Get current date in Eastern timezone as string.
+        
+        The date is reused until the next Eastern midnight. The deadline
+        is wall-clock time, so it still passes while the host is asleep.
+        """
+        if time.time() >= self._eastern_date_until:
+            now = datetime.now(EASTERN_TZ)
+            midnight = datetime.combine(now.date() + timedelta(days=1), dt_time(), EASTERN_TZ)
+            self._eastern_date = now.strftime("%Y-%m-%d")
+            self._eastern_date_until = midnight.timestamp()
+        return self._eastern_date
 
     def _save_tokens(self) -> None:
-        """Save tokens to file for persistence."""
+        """
+        Save tokens to file for persistence.
+        
+        The file is written to a uniquely named temp file beside TOKEN_FILE
+        and renamed over it, so a crash mid-write never leaves a truncated
+        token file behind and processes saving at once (API workers, the
+        MCP server) never share a temp file. It is created owner-only and not fsynced: losing it only means logging in
+        again.
+        """
         if not self.access_token:
             return
         
+        now = time.time()
         data = {
             "access_token": self.access_token,
             "access_token_secret": self.access_token_secret,
-            "last_used": datetime.now(EASTERN_TZ).isoformat(),
+            "last_used": now,
             "token_date": self._get_eastern_date(),
             "sandbox": settings.etrade_sandbox,
         }
         
+        tmp_file = None
         try:
-            TOKEN_FILE.write_text(json.dumps(data, indent=2))
-            logger.info(f"Tokens saved to {TOKEN_FILE}")
+            fd, tmp_file = tempfile.mkstemp(dir=TOKEN_FILE.parent, prefix=".etrade_tokens.")
+            try:
+                os.fchmod(fd, 0o600)
+                os.write(fd, orjson.dumps(data))
+            finally:
+                os.close(fd)
+            os.replace(tmp_file, TOKEN_FILE)
+            tmp_file = None
+            self._tokens_mtime = TOKEN_FILE.stat().st_mtime_ns
+            self._persisted_at = now
+            logger.info("Tokens saved to %s", TOKEN_FILE)
         except Exception as e:
-            logger.error(f"Failed to save tokens: {e}")
+            logger.error("Failed to save tokens: %s", e)
+        finally:
+            if tmp_file is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_file)
+
+    def _persist_due(self) -> bool:
+        """Check if last_used has gone unsaved for PERSIST_INTERVAL."""
+        if self._persisted_at is None:
+            return True
+        return time.time() - self._persisted_at > PERSIST_INTERVAL
 
     def _load_tokens(self) -> bool:
         """Load tokens from file. Returns True if valid tokens loaded."""
-        if not TOKEN_FILE.exists():
+        try:
+            self._tokens_mtime = TOKEN_FILE.stat().st_mtime_ns
+        except OSError:
             logger.info("No saved tokens found")
             return False
         
         try:
-            data = json.loads(TOKEN_FILE.read_text())
+            data = orjson.loads(TOKEN_FILE.read_bytes())
             
             # Check if tokens are for same environment (sandbox/prod)
             if data.get("sandbox") != settings.etrade_sandbox:
@@ -75,42 +192,61 @@ class OAuthManager:
             # Check if tokens are from today (Eastern time)
             token_date = data.get("token_date")
             if token_date != self._get_eastern_date():
-                logger.info(f"Tokens expired (from {token_date}, today is {self._get_eastern_date()})")
+                logger.info("Tokens expired (from %s, today is %s)", token_date, self._get_eastern_date())
                 return False
             
             # Load tokens
             self.access_token = data["access_token"]
             self.access_token_secret = data["access_token_secret"]
-            self.last_used = datetime.fromisoformat(data["last_used"])
+            self._last_used_epoch = float(data["last_used"])
             self.token_date = token_date
+            self._persisted_at = self._last_used_epoch
             
             # Recreate session with access tokens
             self._create_authenticated_session()
             
-            logger.info(f"Loaded saved tokens from {token_date}")
+            logger.info("Loaded saved tokens from %s", token_date)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to load tokens: {e}")
+            logger.error("Failed to load tokens: %s", e)
+            return False
+
+    def _reload_if_changed(self) -> bool:
+        """
+        Load tokens saved since the last load or save, e.g. by the other
+        server process completing a login. An unchanged file is not re-read.
+        """
+        try:
+            mtime = TOKEN_FILE.stat().st_mtime_ns
+        except OSError:
+            return False
+        if mtime == self._tokens_mtime:
             return False
+        return self._load_tokens()
 
     def _create_authenticated_session(self) -> None:
         """Create an authenticated session using stored access tokens."""
-        self.session = OAuth1Session(
-            settings.consumer_key,
-            settings.consumer_secret,
+        self.session = _build_session(
             resource_owner_key=self.access_token,
             resource_owner_secret=self.access_token_secret,
-            signature_type="AUTH_HEADER"
         )
 
     def _is_token_idle(self) -> bool:
         """Check if token has been idle for > 2 hours."""
-        if not self.last_used:
-            return True
-        
-        idle_time = datetime.now(EASTERN_TZ) - self.last_used.replace(tzinfo=EASTERN_TZ)
-        return idle_time > timedelta(hours=2)
+        return time.time() - self._last_used_epoch > TOKEN_IDLE_LIMIT
+
+    def _seconds_until_renewal(self) -> float:
+        """Seconds until the token is due a renewal ahead of going idle."""
+        if not self._last_used_epoch:
+            return 0.0
+        return self._last_used_epoch + TOKEN_IDLE_LIMIT - RENEW_AHEAD - time.time()
+
+    def _renew_ahead(self) -> None:
+        """Renew under the renew lock unless another thread just did."""
+        with self._renew_lock:
+            if self._seconds_until_renewal() <= 0:
+                self._renew_token()
 
     def _renew_token(self) -> bool:
         """Renew access token if idle. Returns True if successful."""
@@ -120,23 +256,18 @@ class OAuthManager:
         try:
             logger.info("Renewing access token...")
             
-            if settings.etrade_sandbox:
-                renew_url = "https://apisb.etrade.com/oauth/renew_access_token"
-            else:
-                renew_url = "https://api.etrade.com/oauth/renew_access_token"
-            
-            response = self.session.get(renew_url)
+            response = self.session.get(RENEW_TOKEN_URL)
             response.raise_for_status()
             
             # Update last used time
-            self.last_used = datetime.now(EASTERN_TZ)
+            self._last_used_epoch = self._renewed_at = time.time()
             self._save_tokens()
             
             logger.info("Access token renewed successfully")
             return True
             
         except Exception as e:
-            logger.error(f"Failed to renew token: {e}")
+            logger.error("Failed to renew token: %s", e)
             return False
 
     def ensure_authenticated(self) -> bool:
@@ -146,7 +277,7 @@ class OAuthManager:
         Returns True if ready to make API calls.
         Returns False if re-authentication is required.
         """
-        if not self.is_authenticated():
+        if not self.is_authenticated() and not self._reload_if_changed():
             return False
         
         # Check if tokens expired (past midnight ET)
@@ -157,44 +288,97 @@ class OAuthManager:
             self.session = None
             return False
         
-        # Check if idle > 2 hours, try to renew
+        # Check if idle > 2 hours, try to renew. Threads that queued on the
+        # lock re-check, and find the token renewed by the first one.
         if self._is_token_idle():
-            logger.info("Token idle > 2 hours, attempting renewal")
-            if not self._renew_token():
-                logger.warning("Token renewal failed, re-auth required")
-                return False
+            with self._renew_lock:
+                if self._is_token_idle():
+                    logger.info("Token idle > 2 hours, attempting renewal")
+                    if not self._renew_token():
+                        logger.warning("Token renewal failed, re-auth required")
+                        return False
         
         # Update last used time
-        self.last_used = datetime.now(EASTERN_TZ)
-        self._save_tokens()
+        self._last_used_epoch = time.time()
+        if self._persist_due():
+            self._save_tokens()
         
         return True
 
+    async def ensure_authenticated_cached(self) -> bool:
+        """
+        Async, cached variant of ensure_authenticated().
+        
+        A successful check is trusted for AUTH_CHECK_TTL seconds. The
+        check itself may renew the token over the network, so it runs in
+        a worker thread, and the lock makes concurrent callers share one
+        check instead of each running their own.
+        """
+        if time.monotonic() < self._auth_valid_until:
+            return True
+        
+        # Any token file reload happens inside ensure_authenticated, in the
+        # worker thread, so no file I/O runs on the event loop
+        async with self._auth_lock:
+            if time.monotonic() < self._auth_valid_until:
+                return True
+            
+            ok = await asyncio.to_thread(self.ensure_authenticated)
+            self._auth_valid_until = time.monotonic() + AUTH_CHECK_TTL if ok else 0.0
+            return ok
+
+    def renew_rejected(self, since: float) -> bool:
+        """
+        Renew after E*TRADE rejected a call made at time since with a 401.
+        
+        Returns True if the call can be retried. Threads rejected together
+        queue on the renew lock, and those finding a renewal made after
+        their call started reuse it instead of renewing again.
+        """
+        with self._renew_lock:
+            if self._renewed_at > since:
+                return True
+            return self._renew_token()
+
+    def invalidate_auth_check(self) -> None:
+        """Stop trusting the cached check, e.g. after E*TRADE answered 401."""
+        self._auth_valid_until = 0.0
+
+    async def refresh_loop(self) -> None:
+        """
+        Renew today's token in the background before it goes idle.
+        
+        Runs for the life of the app, so requests find a live token and
+        the inline renewal in ensure_authenticated() is only a fallback
+        (e.g. after the host was suspended). Tokens from a previous day
+        cannot be renewed and are left for ensure_authenticated() to drop.
+        """
+        while True:
+            if (
+                self.is_authenticated()
+                and self.token_date == self._get_eastern_date()
+                and self._seconds_until_renewal() <= 0
+            ):
+                await asyncio.to_thread(self._renew_ahead)
+            
+            delay = self._seconds_until_renewal()
+            await asyncio.sleep(delay if 0 < delay < REFRESH_POLL_SECONDS else REFRESH_POLL_SECONDS)
+
     def get_request_token(self) -> Dict[str, str]:
         """Step 1 of OAuth flow: Get request token from E*TRADE."""
         try:
             logger.info("Requesting OAuth token from E*TRADE")
             
-            if settings.etrade_sandbox:
-                req_token_url = "https://apisb.etrade.com/oauth/request_token"
-            else:
-                req_token_url = "https://api.etrade.com/oauth/request_token"
-            
-            self.session = OAuth1Session(
-                settings.consumer_key,
-                settings.consumer_secret,
-                callback_uri="oob",
-                signature_type="AUTH_HEADER"
-            )
+            self.session = _build_session(callback_uri="oob")
             
-            self.session.fetch_request_token(req_token_url)
+            self.session.fetch_request_token(REQUEST_TOKEN_URL)
             
             self.request_token = self.session.token['oauth_token']
             self.request_token_secret = self.session.token['oauth_token_secret']
             
-            logger.info(f"Got request token: {self.request_token[:20]}...")
+            logger.info("Got request token: %.20s...", self.request_token)
             
-            authorization_url = f"https://us.etrade.com/e/t/etws/authorize?key={settings.consumer_key}&token={self.request_token}"
+            authorization_url = f"{AUTHORIZE_URL}?key={settings.consumer_key}&token={self.request_token}"
             
             return {
                 "oauth_token": self.request_token,
@@ -203,13 +387,13 @@ class OAuthManager:
             }
             
         except Exception as e:
-            logger.error(f"Error getting request token: {e}")
+            logger.error("Error getting request token: %s", e)
             raise
 
     def set_oauth_verifier(self, verifier: str) -> None:
         """Step 2: User approves on E*TRADE, gets verifier code."""
         self.oauth_verifier = verifier
-        logger.info(f"OAuth verifier set: {verifier}")
+        logger.info("OAuth verifier set: %s", verifier)
 
     def get_access_token(self) -> Dict[str, str]:
         """Step 3: Exchange verifier for access token."""
@@ -222,24 +406,20 @@ class OAuthManager:
         try:
             logger.info("Exchanging OAuth verifier for access token")
             
-            if settings.etrade_sandbox:
-                access_token_url = "https://apisb.etrade.com/oauth/access_token"
-            else:
-                access_token_url = "https://api.etrade.com/oauth/access_token"
-            
             self.session._client.client.verifier = self.oauth_verifier
             
-            access_token = self.session.fetch_access_token(access_token_url)
+            access_token = self.session.fetch_access_token(ACCESS_TOKEN_URL)
             
             self.access_token = access_token['oauth_token']
             self.access_token_secret = access_token['oauth_token_secret']
-            self.last_used = datetime.now(EASTERN_TZ)
+            self._last_used_epoch = time.time()
             self.token_date = self._get_eastern_date()
+            self._auth_valid_until = 0.0
             
             # Save tokens for persistence
             self._save_tokens()
             
-            logger.info(f"Got access token: {self.access_token[:20]}...")
+            logger.info("Got access token: %.20s...", self.access_token)
             
             return {
                 "oauth_token": self.access_token,
@@ -247,7 +427,7 @@ class OAuthManager:
             }
             
         except Exception as e:
-            logger.error(f"Error exchanging verifier for access token: {e}")
+            logger.error("Error exchanging verifier for access token: %s", e)
             raise
 
     def is_authenticated(self) -> bool:
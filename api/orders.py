@@ -0,0 +1,128 @@
+"""Request bodies for the E*TRADE order endpoints."""
+
+import itertools
+import os
+import re
+import time
+
+import orjson
+
+# Values E*TRADE accepts for an equity order, and the price types that
+# need a limitPrice or stopPrice alongside them
+ORDER_ACTIONS = frozenset({"BUY", "SELL", "BUY_TO_COVER", "SELL_SHORT"})
+PRICE_TYPES = frozenset({
+    "MARKET", "LIMIT", "STOP", "STOP_LIMIT", "TRAILING_STOP_CNST",
+    "TRAILING_STOP_PRCT", "MARKET_ON_OPEN", "MARKET_ON_CLOSE",
+    "LIMIT_ON_OPEN", "LIMIT_ON_CLOSE",
+})
+LIMIT_PRICE_TYPES = frozenset({"LIMIT", "STOP_LIMIT", "LIMIT_ON_OPEN", "LIMIT_ON_CLOSE"})
+STOP_PRICE_TYPES = frozenset({"STOP", "STOP_LIMIT", "TRAILING_STOP_CNST", "TRAILING_STOP_PRCT"})
+SYMBOL_RE = re.compile(r"[A-Z0-9.\-]{1,10}")
+
+# clientOrderIds must be unique per account and at most 20 characters.
+# Counting up from the start time in milliseconds keeps them unique
+# within the process without reading the clock per order; the three-digit
+# pid tag keeps workers (and the MCP server) started in the same
+# millisecond range apart. Tag and count take 16 characters, leaving 4
+# for a prefix.
+CLIENT_ORDER_ID_MAX = 20
+_client_order_ids = itertools.count(int(time.time() * 1000))
+
+# CancelOrderRequest has a single dynamic field, so its body is assembled
+# around the JSON-encoded order ID
+CANCEL_ORDER_PREFIX = b'{"CancelOrderRequest":{"orderId":'
+CANCEL_ORDER_SUFFIX = b"}}"
+
+
+def next_client_order_id(prefix: str = "") -> str:
+    """A clientOrderId not used before by this or another local process."""
+    client_order_id = f"{prefix}{os.getpid() % 1000:03d}{next(_client_order_ids)}"
+    if len(client_order_id) > CLIENT_ORDER_ID_MAX:
+        raise ValueError(f"clientOrderId prefix {prefix!r} is too long")
+    return client_order_id
+
+
+def normalize_order(order: dict) -> dict:
+    """
+    Return a copy of the simplified order dict in the form E*TRADE expects.
+
+    Action, symbol and price type are upper-cased and a quantity given as
+    a whole-number string (e.g. "10") becomes an int. Values that cannot
+    be normalized are left for validate_order to reject.
+    """
+    order = dict(order)
+    for field in ("action", "symbol", "priceType"):
+        if isinstance(order.get(field), str):
+            order[field] = order[field].strip().upper()
+    quantity = order.get("quantity")
+    if isinstance(quantity, str) and quantity.strip().isdigit():
+        order["quantity"] = int(quantity)
+    return order
+
+
+def validate_order(order: dict) -> str | None:
+    """
+    Return why the simplified order dict cannot be sent, or None.
+
+    Only mistakes that need no account data are caught, so they fail
+    without a round trip; everything else is left to E*TRADE's preview.
+    """
+    price_type = order.get("priceType", "MARKET")
+    quantity = order.get("quantity")
+    if order.get("action") not in ORDER_ACTIONS:
+        return f"Action must be one of {', '.join(sorted(ORDER_ACTIONS))}"
+    if not isinstance(quantity, int) or isinstance(quantity, bool) or quantity <= 0:
+        return "Quantity must be a positive whole number"
+    if price_type not in PRICE_TYPES:
+        return f"Unknown price type {price_type}"
+    if price_type in LIMIT_PRICE_TYPES and not order.get("limitPrice"):
+        return f"{price_type} orders need a limit price"
+    if price_type in STOP_PRICE_TYPES and not order.get("stopPrice"):
+        return f"{price_type} orders need a stop price"
+    if not SYMBOL_RE.fullmatch(str(order.get("symbol", "")).upper()):
+        return f"Invalid symbol {order.get('symbol')!r}"
+    return None
+
+
+def build_order_body(kind: str, order: dict, preview_id: str = None) -> bytes:
+    """
+    Encode an E*TRADE order request body from the simplified order dict.
+
+    Quantities and prices are written as JSON numbers, as E*TRADE's
+    schema types them.
+
+    Args:
+        kind: Request wrapper, "PreviewOrderRequest" or "PlaceOrderRequest"
+        order: Order dict as documented on preview_order
+        preview_id: previewId to place against (place only)
+    """
+    details = {
+        "allOrNone": "false",
+        "priceType": order.get("priceType", "MARKET"),
+        "orderTerm": order.get("orderTerm", "GOOD_FOR_DAY"),
+        "marketSession": order.get("marketSession", "REGULAR"),
+        "Instrument": [{
+            "Product": {"securityType": "EQ", "symbol": order["symbol"]},
+            "orderAction": order["action"],
+            "quantityType": "QUANTITY",
+            "quantity": order["quantity"],
+        }],
+    }
+    if order.get("limitPrice"):
+        details["limitPrice"] = order["limitPrice"]
+    if order.get("stopPrice"):
+        details["stopPrice"] = order["stopPrice"]
+
+    body = {
+        "orderType": order.get("orderType", "EQ"),
+        "clientOrderId": order.get("clientOrderId") or next_client_order_id(),
+    }
+    if preview_id is not None:
+        body["PreviewIds"] = [{"previewId": preview_id}]
+    body["Order"] = [details]
+    return orjson.dumps({kind: body})
+
+
+def build_cancel_body(order_id) -> bytes:
+    """Encode a CancelOrderRequest body for order_id."""
+    return CANCEL_ORDER_PREFIX + orjson.dumps(order_id) + CANCEL_ORDER_SUFFIX
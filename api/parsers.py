@@ -0,0 +1,207 @@
+"""Parsers turning E*TRADE XML bodies into JSON-ready structures."""
+
+import io
+
+from lxml import etree
+
+# E*TRADE bodies are parsed without expanding entities or fetching DTDs
+XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+
+# Nested Position fields, compiled once; the rest are direct children
+POSITION_SYMBOL = etree.XPath("string(Product/symbol)", smart_strings=False)
+POSITION_PRICE = etree.XPath(".//lastTrade/text()", smart_strings=False)
+POSITION_NUMBERS = ("quantity", "marketValue", "totalGain", "totalGainPct")
+
+
+def iter_elements(source, tag: str):
+    """
+    Stream elements named tag out of an XML body.
+
+    source is the body as bytes or a binary file object, such as a raw
+    HTTP response read while it downloads. Each element is cleared after
+    the caller has consumed it, along with the siblings before it, so
+    memory stays flat for large documents.
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    events = etree.iterparse(source, tag=tag, resolve_entities=False, no_network=True)
+    for _, elem in events:
+        yield elem
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+
+def element_to_dict(elem) -> dict | str | None:
+    """
+    Convert an element to nested dicts keyed by child tag.
+
+    Leaf elements become their text; repeated child tags become lists.
+    """
+    if len(elem) == 0:
+        return elem.text
+    result = {}
+    for child in elem:
+        value = element_to_dict(child)
+        if child.tag not in result:
+            result[child.tag] = value
+        elif isinstance(result[child.tag], list):
+            result[child.tag].append(value)
+        else:
+            result[child.tag] = [result[child.tag], value]
+    return result
+
+
+def parse_accounts_xml(content: bytes) -> list[dict]:
+    """Extract every Account from an accounts/list body as a flat dict."""
+    return [
+        {child.tag: child.text for child in account}
+        for account in iter_elements(content, "Account")
+    ]
+
+
+def parse_balance_xml(content: bytes) -> dict:
+    """Convert a balance body to nested dicts (e.g. Computed, Cash, Margin)."""
+    return element_to_dict(etree.fromstring(content, XML_PARSER))
+
+
+def _number(text) -> float:
+    """text as a float, or 0 if it is missing or not a number."""
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return 0
+
+
+def parse_cash_xml(content: bytes) -> float:
+    """Return cashAvailableForInvestment from a balance body (0 if absent or empty)."""
+    for elem in iter_elements(content, "cashAvailableForInvestment"):
+        return _number(elem.text)
+    return 0
+
+
+def _position_summary(p) -> dict:
+    """Symbol, quantity, price, value and gain of one Position element."""
+    # One pass over the direct children for the top-level fields; the
+    # nested symbol and price use the precompiled XPaths
+    fields = {child.tag: child.text for child in p}
+    price = POSITION_PRICE(p)
+    quantity, market_value, gain, gain_pct = (
+        _number(fields.get(name)) for name in POSITION_NUMBERS
+    )
+    return {
+        "symbol": POSITION_SYMBOL(p),
+        "quantity": quantity,
+        "price": _number(price[0]) if price else 0,
+        "marketValue": market_value,
+        "gain": gain,
+        "gainPct": gain_pct,
+    }
+
+
+def parse_positions_xml(content: bytes) -> list[dict]:
+    """Convert every Position of a portfolio body to nested dicts."""
+    return [element_to_dict(p) for p in iter_elements(content, "Position")]
+
+
+def parse_position_summaries_xml(content: bytes) -> list[dict]:
+    """
+    Extract symbol, quantity, price, value and gain for each Position.
+
+    Missing or empty numbers default to 0.
+    """
+    return [_position_summary(p) for p in iter_elements(content, "Position")]
+
+
+class ElementFeed:
+    """
+    Convert elements named tag out of a body that arrives in chunks.
+
+    Each element is passed to convert as soon as its closing tag has been
+    fed, so only the unparsed tail of the body is ever held in memory.
+    """
+
+    def __init__(self, tag: str, convert):
+        """Start an empty pull parser listening for tag elements."""
+        self._parser = etree.XMLPullParser(
+            events=("end",), tag=tag, resolve_entities=False, no_network=True
+        )
+        self._convert = convert
+        self.items: list = []
+
+    def feed(self, chunk: bytes) -> None:
+        """Parse the next chunk of the body."""
+        self._parser.feed(chunk)
+        self._drain()
+
+    def close(self) -> list:
+        """Finish the body and return every converted element."""
+        self._parser.close()
+        self._drain()
+        return self.items
+
+    def _drain(self) -> None:
+        for _, elem in self._parser.read_events():
+            self.items.append(self._convert(elem))
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+
+class PositionsFeed(ElementFeed):
+    """parse_positions_xml for a body that arrives in chunks."""
+
+    def __init__(self):
+        """Start an empty feed of Position elements."""
+        super().__init__("Position", element_to_dict)
+
+
+def parse_lookup_xml(content: bytes) -> list[dict]:
+    """Extract every Data entry (symbol, description, type) of a lookup body."""
+    return [
+        {child.tag: child.text for child in data}
+        for data in iter_elements(content, "Data")
+    ]
+
+
+def parse_option_chains_xml(content: bytes) -> dict:
+    """
+    Convert an option chain body to nested dicts.
+
+    OptionPair is always a list, even when the chain has a single strike.
+    """
+    chain = {}
+    pairs = []
+    for child in etree.fromstring(content, XML_PARSER):
+        if child.tag == "OptionPair":
+            pairs.append(element_to_dict(child))
+        else:
+            chain[child.tag] = element_to_dict(child)
+    chain["OptionPair"] = pairs
+    return chain
+
+
+def parse_option_expire_dates_xml(content: bytes) -> list[dict]:
+    """Extract every ExpirationDate (year, month, day, expiryType) as a flat dict."""
+    return [
+        {child.tag: child.text for child in date}
+        for date in iter_elements(content, "ExpirationDate")
+    ]
+
+
+def parse_quotes_xml(content: bytes) -> tuple[list[dict], list[dict]]:
+    """
+    Split a quote body into QuoteData dicts and Messages.
+
+    Messages carry E*TRADE's notices, e.g. for invalid symbols.
+    """
+    quotes = []
+    messages = []
+    for child in etree.fromstring(content, XML_PARSER):
+        if child.tag == "QuoteData":
+            quotes.append(element_to_dict(child))
+        elif child.tag == "Messages":
+            messages.extend(
+                element_to_dict(message) for message in child.iter("Message")
+            )
+    return quotes, messages
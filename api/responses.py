@@ -0,0 +1,13 @@
+"""Response classes shared by the API."""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson straight to bytes."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
@@ -1,16 +1,34 @@
 """FastMCP server for E*TRADE API integration."""
 
 import sys
+import asyncio
 import logging
-import json
-import xml.etree.ElementTree as ET
+import threading
+import time
+from functools import lru_cache, wraps
+from cachetools import TTLCache, cached
+import httpx
+import orjson
 from fastmcp import FastMCP
+from fastmcp.tools import ToolResult
+from lxml import etree
+from mcp.types import TextContent
 
 # Add parent to path for imports
 sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
 
 from api.oauth import oauth_manager
 from api.config import settings
+from api.http_client import create_async_client
+from api.orders import (
+    PRICE_TYPES,
+    build_cancel_body,
+    build_order_body,
+    next_client_order_id,
+    normalize_order,
+    validate_order,
+)
+from api.parsers import ElementFeed, parse_cash_xml, parse_position_summaries_xml
 
 # Configure logging
 logging.basicConfig(
@@ -21,25 +39,223 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# E*TRADE API base for the configured environment, resolved once at import
+BASE_URL = settings.etrade_base_url
+
+# Query string for the per-account real-time balance
+BALANCE_PARAMS = {"instType": "BROKERAGE", "realTimeNAV": "true"}
+
+# E*TRADE answers at most this many symbols per quote call
+QUOTE_MAX_SYMBOLS = 25
+
+# Fields copied from a quote's All block, as floats
+QUOTE_FIELDS = ("lastTrade", "bid", "ask", "changeClose", "changeClosePercentage")
+
+# Order-list fields, compiled once. Each path sits at a fixed depth under
+# an Order and yields at most one text node.
+ORDER_FIELDS = {
+    field: etree.XPath(path + "/text()", smart_strings=False)
+    for field, path in (
+        ("orderId", "orderId"),
+        ("orderType", "orderType"),
+        ("status", "OrderDetail/status"),
+        ("symbol", "OrderDetail/Instrument/Product/symbol"),
+        ("quantity", "OrderDetail/Instrument/orderedQuantity"),
+        ("priceType", "OrderDetail/priceType"),
+    )
+}
+
+# orderType, status and priceType come from small enumerations; mapping
+# each parsed value onto one shared string lets every order row reuse it
+ORDER_ENUM_FIELDS = ("orderType", "status", "priceType")
+ORDER_ENUM_VALUES = {
+    value: value
+    for value in (
+        *PRICE_TYPES, "EQ", "OPTN", "SPREADS", "BUY_WRITES", "MUTUAL_FUND",
+        "OPEN", "EXECUTED", "CANCELLED", "CANCEL_REQUESTED", "INDIVIDUAL_FILLS",
+        "EXPIRED", "REJECTED", "PARTIAL", "OPEN_PENDING",
+    )
+}
+
+# Read size for order lists parsed while they stream in
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# The flat read and order-entry tools ask E*TRADE for JSON; the summary
+# and order list stay on XML, which the shared streaming parsers consume
+ACCEPT_JSON = {"Accept": "application/json"}
+ORDER_HEADERS = {"Content-Type": "application/json", **ACCEPT_JSON}
+
+
+def order_dict(order) -> dict:
+    """The ORDER_FIELDS of one Order element."""
+    row = {field: (path(order) or [None])[0] for field, path in ORDER_FIELDS.items()}
+    for field in ORDER_ENUM_FIELDS:
+        value = row[field]
+        row[field] = ORDER_ENUM_VALUES.get(value, value)
+    return row
+
+
+def float_or_none(value):
+    """value as a float, or None when it is absent."""
+    return float(value) if value is not None else None
+
+
 # Create FastMCP server
 server = FastMCP("etrade-api")
-logger.info(f"E*TRADE MCP Server initialized (sandbox={settings.etrade_sandbox})")
+logger.info("E*TRADE MCP Server initialized (sandbox=%s)", settings.etrade_sandbox)
 
 
-def get_base_url():
-    """Get E*TRADE API base URL based on sandbox setting."""
-    if settings.etrade_sandbox:
-        return "https://apisb.etrade.com/v1"
-    return "https://api.etrade.com/v1"
+@lru_cache
+def get_http_client():
+    """Shared async client (OAuth-signed, HTTP/2) for data and order calls."""
+    return create_async_client()
 
 
-def ensure_auth():
-    """Check authentication, return error dict if not authenticated."""
-    if not oauth_manager.ensure_authenticated():
+async def ensure_auth():
+    """
+    Check authentication, return error dict if not authenticated.
+    
+    A successful check is reused for AUTH_CHECK_TTL seconds, so bursts of
+    tool calls pay for one check.
+    """
+    if not await oauth_manager.ensure_authenticated_cached():
         return {"status": "error", "error": "Not authenticated. Run etrade_auth_status to get auth URL."}
     return None
 
 
+def error_message(exc: Exception) -> str:
+    """Short description of a failure, for a tool's error result."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return f"E*TRADE returned {exc.response.status_code} {exc.response.reason_phrase}"
+    if isinstance(exc, httpx.RequestError):
+        return f"E*TRADE request failed: {exc!r}"
+    return str(exc)
+
+
+def is_unauthorized(exc: Exception) -> bool:
+    """True if exc is E*TRADE rejecting the access token."""
+    response = getattr(exc, "response", None)
+    return response is not None and response.status_code == 401
+
+
+def tool_result(result: dict) -> ToolResult:
+    """
+    result as a finished tool response.
+    
+    FastMCP would otherwise render a dict through pydantic twice (once
+    for the structured content, once for its text); here the text is
+    encoded once with orjson and the dict passed through untouched.
+    """
+    return ToolResult(
+        content=[TextContent(type="text", text=orjson.dumps(result).decode())],
+        structured_content=result,
+    )
+
+
+def etrade_tool(fn):
+    """
+    Wrap a tool that calls E*TRADE.
+    
+    The wrapped tool runs only once ensure_auth() passes, and any failure
+    it raises is returned as an error result instead; either way the dict
+    is sent through tool_result(). A token rejected with a 401 (e.g. gone
+    idle) is renewed once and the call replayed; E*TRADE executes nothing
+    it answers 401, so replaying is safe.
+    """
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        auth_err = await ensure_auth()
+        if auth_err:
+            return tool_result(auth_err)
+        started = time.time()
+        try:
+            try:
+                return tool_result(await fn(*args, **kwargs))
+            except Exception as e:
+                if not is_unauthorized(e):
+                    raise
+                if not await asyncio.to_thread(oauth_manager.renew_rejected, started):
+                    raise
+            logger.info("%s retried after renewing the access token", fn.__name__)
+            return tool_result(await fn(*args, **kwargs))
+        except Exception as e:
+            message = error_message(e)
+            logger.error("%s failed: %s", fn.__name__, message)
+            return tool_result({"status": "error", "error": message})
+    return wrapper
+
+
+# =============================================================================
+# Cached Reads
+# =============================================================================
+
+# Read-only results are reused across tool calls for a short while; a
+# caller arriving while the same key is being fetched waits for it.
+ACCOUNTS_CACHE_TTL = 300
+QUOTE_CACHE_TTL = 5
+LOOKUP_CACHE_TTL = 300
+accounts_cache = TTLCache(maxsize=1, ttl=ACCOUNTS_CACHE_TTL)
+quote_cache = TTLCache(maxsize=512, ttl=QUOTE_CACHE_TTL)
+lookup_cache = TTLCache(maxsize=512, ttl=LOOKUP_CACHE_TTL)
+
+
+def get_json(url: str, **kwargs) -> dict:
+    """GET url from E*TRADE as JSON with the OAuth session."""
+    response = oauth_manager.session.get(url, headers=ACCEPT_JSON, **kwargs)
+    if response.status_code == 401:
+        oauth_manager.invalidate_auth_check()
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+@cached(accounts_cache, condition=threading.Condition())
+def fetch_accounts() -> list[dict]:
+    """Accounts from accounts/list."""
+    body = get_json(f"{BASE_URL}/accounts/list")
+    return [
+        {
+            "accountIdKey": acct.get("accountIdKey"),
+            "accountId": acct.get("accountId"),
+            "accountDesc": acct.get("accountDesc"),
+            "accountType": acct.get("accountType"),
+        }
+        for acct in body["AccountListResponse"].get("Accounts", {}).get("Account", [])
+    ]
+
+
+@cached(quote_cache, condition=threading.Condition())
+def fetch_quotes(symbols: str) -> list[dict]:
+    """Quotes for a normalized symbol list (see quote_key)."""
+    body = get_json(f"{BASE_URL}/market/quote/{symbols}")
+    quotes = []
+    for q in body["QuoteResponse"].get("QuoteData", []):
+        all_data = q.get("All", {})
+        quote = {"symbol": q.get("Product", {}).get("symbol") or symbols}
+        for field in QUOTE_FIELDS:
+            quote[field] = float_or_none(all_data.get(field))
+        quotes.append(quote)
+    return quotes
+
+
+@cached(lookup_cache, condition=threading.Condition())
+def lookup(search: str) -> list[dict]:
+    """Securities matching search."""
+    body = get_json(f"{BASE_URL}/market/lookup/{search}")
+    return [
+        {
+            "symbol": data.get("symbol"),
+            "description": data.get("description"),
+            "type": data.get("type"),
+        }
+        for data in body["LookupResponse"].get("Data", [])
+    ]
+
+
+def quote_key(symbols: str) -> str:
+    """Canonical form of a symbol list, so "msft, AAPL" and "AAPL,MSFT" share a cache entry."""
+    return ",".join(sorted({s.strip().upper() for s in symbols.split(",") if s.strip()}))
+
+
 # =============================================================================
 # Authentication Tools
 # =============================================================================
@@ -79,10 +295,11 @@ def etrade_auth_callback(verifier: str) -> dict:
     Args:
         verifier: The verification code shown after authorizing on E*TRADE
     """
-    logger.info(f"Tool: etrade_auth_callback")
+    logger.info("Tool: etrade_auth_callback")
     try:
         oauth_manager.set_oauth_verifier(verifier)
         oauth_manager.get_access_token()
+        accounts_cache.clear()
         return {
             "status": "success",
             "authenticated": oauth_manager.is_authenticated(),
@@ -97,132 +314,99 @@ def etrade_auth_callback(verifier: str) -> dict:
 # =============================================================================
 
 @server.tool()
-def etrade_get_accounts() -> dict:
+@etrade_tool
+async def etrade_get_accounts() -> dict:
     """Get list of all E*TRADE accounts."""
     logger.info("Tool: etrade_get_accounts")
     
-    auth_err = ensure_auth()
-    if auth_err:
-        return auth_err
-    
-    try:
-        url = f"{get_base_url()}/accounts/list"
-        response = oauth_manager.session.get(url)
-        response.raise_for_status()
-        
-        # Parse XML to JSON
-        root = ET.fromstring(response.text)
-        accounts = []
-        for acct in root.findall('.//Account'):
-            accounts.append({
-                "accountIdKey": acct.find('accountIdKey').text,
-                "accountId": acct.find('accountId').text,
-                "accountDesc": acct.find('accountDesc').text,
-                "accountType": acct.find('accountType').text,
-            })
-        
-        return {"status": "success", "accounts": accounts}
-    except Exception as e:
-        return {"status": "error", "error": str(e)}
+    return {"status": "success", "accounts": await asyncio.to_thread(fetch_accounts)}
 
 
 @server.tool()
-def etrade_get_summary() -> dict:
+@etrade_tool
+async def etrade_get_summary() -> dict:
     """Get comprehensive summary of all accounts with balances and positions.
     
     Returns each account with cash balance, portfolio value, and all positions.
+    An account whose balance or portfolio cannot be fetched carries an
+    error instead and is left out of the totals.
     """
     logger.info("Tool: etrade_get_summary")
     
-    auth_err = ensure_auth()
-    if auth_err:
-        return auth_err
+    accounts_data = []
+    total_cash = 0
+    total_portfolio = 0
+    total_gain = 0
     
-    try:
-        base_url = get_base_url()
-        
-        # Get accounts
-        resp = oauth_manager.session.get(f"{base_url}/accounts/list")
-        resp.raise_for_status()
-        root = ET.fromstring(resp.text)
+    accounts = [
+        {
+            "accountIdKey": acct["accountIdKey"],
+            "accountDesc": acct["accountDesc"],
+            "accountType": acct["accountType"],
+        }
+        for acct in await asyncio.to_thread(fetch_accounts)
+    ]
+    
+    # Every balance and portfolio is requested at once over the shared
+    # HTTP/2 connection; gather returns them in account order
+    http = get_http_client()
+    account_urls = [f"{BASE_URL}/accounts/{acct['accountIdKey']}" for acct in accounts]
+    responses = await asyncio.gather(
+        *(http.get(url + "/balance", params=BALANCE_PARAMS) for url in account_urls),
+        *(http.get(url + "/portfolio") for url in account_urls),
+        return_exceptions=True,
+    )
+    
+    # A rejected token fails the whole call, so etrade_tool renews it and
+    # replays; any other failure is reported against its account only
+    for response in responses:
+        if isinstance(response, httpx.Response) and response.status_code == 401:
+            response.raise_for_status()
+    balances = responses[:len(accounts)]
+    portfolios = responses[len(accounts):]
+    
+    for acct_info, bal_resp, port_resp in zip(accounts, balances, portfolios):
+        try:
+            for response in (bal_resp, port_resp):
+                if isinstance(response, Exception):
+                    raise response
+                response.raise_for_status()
+            cash = parse_cash_xml(bal_resp.content)
+            # Positions are stream-parsed, each element freed once read
+            positions = parse_position_summaries_xml(port_resp.content)
+        except Exception as e:
+            accounts_data.append({"account": acct_info, "error": error_message(e)})
+            continue
         
-        accounts_data = []
-        total_cash = 0
-        total_portfolio = 0
-        total_gain = 0
+        portfolio_value = 0
+        account_gain = 0
+        for position in positions:
+            portfolio_value += position["marketValue"]
+            account_gain += position["gain"]
         
-        for account in root.findall('.//Account'):
-            acct_key = account.find('accountIdKey').text
-            acct_info = {
-                "accountIdKey": acct_key,
-                "accountDesc": account.find('accountDesc').text,
-                "accountType": account.find('accountType').text,
-            }
-            
-            # Get balance
-            bal_resp = oauth_manager.session.get(
-                f"{base_url}/accounts/{acct_key}/balance",
-                params={"instType": "BROKERAGE", "realTimeNAV": "true"}
-            )
-            cash = 0
-            if bal_resp.status_code == 200:
-                bal_root = ET.fromstring(bal_resp.text)
-                cash_elem = bal_root.find('.//cashAvailableForInvestment')
-                cash = float(cash_elem.text) if cash_elem is not None else 0
-            
-            # Get positions
-            port_resp = oauth_manager.session.get(f"{base_url}/accounts/{acct_key}/portfolio")
-            positions = []
-            portfolio_value = 0
-            account_gain = 0
-            
-            if port_resp.status_code == 200:
-                port_root = ET.fromstring(port_resp.text)
-                for p in port_root.findall('.//Position'):
-                    symbol = p.find('.//symbol').text
-                    qty = float(p.find('quantity').text)
-                    price_elem = p.find('.//lastTrade')
-                    price = float(price_elem.text) if price_elem is not None else 0
-                    value = float(p.find('marketValue').text)
-                    gain = float(p.find('totalGain').text)
-                    gain_pct = float(p.find('totalGainPct').text)
-                    
-                    positions.append({
-                        "symbol": symbol,
-                        "quantity": qty,
-                        "price": price,
-                        "marketValue": value,
-                        "gain": gain,
-                        "gainPct": gain_pct,
-                    })
-                    portfolio_value += value
-                    account_gain += gain
-            
-            accounts_data.append({
-                "account": acct_info,
-                "cash": cash,
-                "portfolioValue": portfolio_value,
-                "totalValue": cash + portfolio_value,
-                "totalGain": account_gain,
-                "positions": positions,
-            })
-            
-            total_cash += cash
-            total_portfolio += portfolio_value
-            total_gain += account_gain
+        accounts_data.append({
+            "account": acct_info,
+            "cash": cash,
+            "portfolioValue": portfolio_value,
+            "totalValue": cash + portfolio_value,
+            "totalGain": account_gain,
+            "positions": positions,
+        })
         
-        return {
-            "status": "success",
-            "accounts": accounts_data,
-            "totals": {
-                "cash": total_cash,
-                "portfolioValue": total_portfolio,
-                "totalValue": total_cash + total_portfolio,
-                "totalGain": total_gain,
-            },
-        }
-    except Exception as e:
-        return {"status": "error", "error": str(e)}
+        total_cash += cash
+        total_portfolio += portfolio_value
+        total_gain += account_gain
+    
+    return {
+        "status": "success",
+        "accounts": accounts_data,
+        "totals": {
+            "cash": total_cash,
+            "portfolioValue": total_portfolio,
+            "totalValue": total_cash + total_portfolio,
+            "totalGain": total_gain,
+        },
+    }
 
 
 # =============================================================================
@@ -230,123 +414,110 @@ def etrade_get_summary() -> dict:
 # =============================================================================
 
 @server.tool()
-def etrade_get_quote(symbols: str) -> dict:
+@etrade_tool
+async def etrade_get_quote(symbols: str) -> dict:
     """Get stock quotes for one or more symbols.
     
     Args:
         symbols: Comma-separated symbols (e.g., "AAPL,MSFT,TSLA")
     """
-    logger.info(f"Tool: etrade_get_quote({symbols})")
-    
-    auth_err = ensure_auth()
-    if auth_err:
-        return auth_err
+    logger.info("Tool: etrade_get_quote(%s)", symbols)
     
-    try:
-        url = f"{get_base_url()}/market/quote/{symbols}"
-        response = oauth_manager.session.get(url)
-        response.raise_for_status()
-        
-        # Parse quotes
-        root = ET.fromstring(response.text)
-        quotes = []
-        for q in root.findall('.//QuoteData'):
-            all_data = q.find('.//All')
-            quotes.append({
-                "symbol": q.find('.//Product/symbol').text if q.find('.//Product/symbol') is not None else symbols,
-                "lastTrade": float(all_data.find('lastTrade').text) if all_data.find('lastTrade') is not None else None,
-                "bid": float(all_data.find('bid').text) if all_data.find('bid') is not None else None,
-                "ask": float(all_data.find('ask').text) if all_data.find('ask') is not None else None,
-                "changeClose": float(all_data.find('changeClose').text) if all_data.find('changeClose') is not None else None,
-                "changeClosePercentage": float(all_data.find('changeClosePercentage').text) if all_data.find('changeClosePercentage') is not None else None,
-            })
-        
-        return {"status": "success", "quotes": quotes}
-    except Exception as e:
-        return {"status": "error", "error": str(e)}
+    # Longer lists are split into QUOTE_MAX_SYMBOLS-symbol calls made
+    # concurrently, each cached under its own key
+    key = quote_key(symbols).split(",")
+    chunks = await asyncio.gather(*(
+        asyncio.to_thread(fetch_quotes, ",".join(key[i:i + QUOTE_MAX_SYMBOLS]))
+        for i in range(0, len(key), QUOTE_MAX_SYMBOLS)
+    ))
+    return {"status": "success", "quotes": [q for chunk in chunks for q in chunk]}
 
 
 @server.tool()
-def etrade_lookup_symbol(search: str) -> dict:
+@etrade_tool
+async def etrade_lookup_symbol(search: str) -> dict:
     """Search for securities by name or partial symbol.
     
     Args:
         search: Search term (e.g., "apple", "micro")
     """
-    logger.info(f"Tool: etrade_lookup_symbol({search})")
-    
-    auth_err = ensure_auth()
-    if auth_err:
-        return auth_err
+    logger.info("Tool: etrade_lookup_symbol(%s)", search)
     
-    try:
-        url = f"{get_base_url()}/market/lookup/{search}"
-        response = oauth_manager.session.get(url)
-        response.raise_for_status()
-        
-        root = ET.fromstring(response.text)
-        results = []
-        for data in root.findall('.//Data'):
-            results.append({
-                "symbol": data.find('symbol').text,
-                "description": data.find('description').text,
-                "type": data.find('type').text,
-            })
-        
-        return {"status": "success", "results": results}
-    except Exception as e:
-        return {"status": "error", "error": str(e)}
+    return {"status": "success", "results": await asyncio.to_thread(lookup, search)}
 
 
 # =============================================================================
 # Order Tools
 # =============================================================================
 
+async def fetch_orders(account_id_key: str, status: str = None) -> list[dict]:
+    """ORDER_FIELDS of each order in an account, optionally filtered by status."""
+    url = f"{BASE_URL}/accounts/{account_id_key}/orders"
+    params = {}
+    if status:
+        params["status"] = status
+    
+    # Orders are parsed while the body downloads, each one freed once its
+    # fields are read
+    feed = ElementFeed("Order", order_dict)
+    async with get_http_client().stream("GET", url, params=params) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+            feed.feed(chunk)
+    return feed.close()
+
+
 @server.tool()
-def etrade_list_orders(account_id_key: str, status: str = None) -> dict:
+@etrade_tool
+async def etrade_list_orders(account_id_key: str, status: str = None) -> dict:
     """List orders for an account.
     
     Args:
         account_id_key: Account ID key from etrade_get_accounts
         status: Filter by status (OPEN, EXECUTED, CANCELLED, etc.)
     """
-    logger.info(f"Tool: etrade_list_orders({account_id_key})")
+    logger.info("Tool: etrade_list_orders(%s)", account_id_key)
     
-    auth_err = ensure_auth()
-    if auth_err:
-        return auth_err
+    return {"status": "success", "orders": await fetch_orders(account_id_key, status)}
+
+
+@server.tool()
+@etrade_tool
+async def etrade_list_orders_all(account_id_keys: list[str] = None, status: str = None) -> dict:
+    """List orders for several accounts at once.
     
-    try:
-        url = f"{get_base_url()}/accounts/{account_id_key}/orders"
-        params = {}
-        if status:
-            params["status"] = status
-        
-        response = oauth_manager.session.get(url, params=params)
-        response.raise_for_status()
-        
-        # Parse orders
-        root = ET.fromstring(response.text)
-        orders = []
-        for order in root.findall('.//Order'):
-            order_detail = order.find('.//OrderDetail')
-            instrument = order.find('.//Instrument')
-            orders.append({
-                "orderId": order.find('orderId').text,
-                "orderType": order.find('orderType').text,
-                "status": order_detail.find('status').text if order_detail is not None else None,
-                "symbol": instrument.find('.//symbol').text if instrument is not None else None,
-                "quantity": instrument.find('orderedQuantity').text if instrument is not None else None,
-                "priceType": order_detail.find('priceType').text if order_detail is not None else None,
-            })
-        
-        return {"status": "success", "orders": orders}
-    except Exception as e:
-        return {"status": "error", "error": str(e)}
+    Args:
+        account_id_keys: Account ID keys from etrade_get_accounts (default: all accounts)
+        status: Filter by status (OPEN, EXECUTED, CANCELLED, etc.)
+    
+    Returns orders keyed by account ID key; accounts whose request failed
+    are listed under errors instead.
+    """
+    logger.info("Tool: etrade_list_orders_all(%s)", account_id_keys)
+    
+    if not account_id_keys:
+        accounts = await asyncio.to_thread(fetch_accounts)
+        account_id_keys = [acct["accountIdKey"] for acct in accounts]
+    
+    # Every account is requested at once over the shared connection
+    results = await asyncio.gather(
+        *(fetch_orders(key, status) for key in account_id_keys),
+        return_exceptions=True,
+    )
+    orders = {}
+    errors = {}
+    for key, result in zip(account_id_keys, results):
+        if isinstance(result, Exception):
+            errors[key] = error_message(result)
+        else:
+            orders[key] = result
+    
+    return {"status": "success", "orders": orders, "errors": errors}
 
 
 @server.tool()
-def etrade_preview_order(
+@etrade_tool
+async def etrade_preview_order(
     account_id_key: str,
     symbol: str,
     action: str,
@@ -370,63 +541,45 @@ def etrade_preview_order(
     
     Returns preview with previewId needed for placing order.
     """
-    logger.info(f"Tool: etrade_preview_order({symbol} {action} {quantity})")
+    logger.info("Tool: etrade_preview_order(%s %s %s)", symbol, action, quantity)
     
-    auth_err = ensure_auth()
-    if auth_err:
-        return auth_err
+    url = f"{BASE_URL}/accounts/{account_id_key}/orders/preview"
+    order = {
+        "clientOrderId": next_client_order_id("mcp-"),
+        "symbol": symbol,
+        "action": action,
+        "quantity": quantity,
+        "priceType": price_type,
+        "orderTerm": order_term,
+        "limitPrice": limit_price,
+        "stopPrice": stop_price,
+    }
+    order = normalize_order(order)
+    error = validate_order(order)
+    if error:
+        return {"status": "error", "error": error}
     
-    try:
-        import time
-        url = f"{get_base_url()}/accounts/{account_id_key}/orders/preview"
-        
-        order = {
-            "PreviewOrderRequest": {
-                "orderType": "EQ",
-                "clientOrderId": f"mcp-{int(time.time())}",
-                "Order": [{
-                    "allOrNone": "false",
-                    "priceType": price_type,
-                    "orderTerm": order_term,
-                    "marketSession": "REGULAR",
-                    "Instrument": [{
-                        "Product": {"securityType": "EQ", "symbol": symbol},
-                        "orderAction": action,
-                        "quantityType": "QUANTITY",
-                        "quantity": str(quantity),
-                    }]
-                }]
-            }
-        }
-        
-        if limit_price:
-            order["PreviewOrderRequest"]["Order"][0]["limitPrice"] = str(limit_price)
-        if stop_price:
-            order["PreviewOrderRequest"]["Order"][0]["stopPrice"] = str(stop_price)
-        
-        response = oauth_manager.session.post(
-            url,
-            headers={"Content-Type": "application/json"},
-            data=json.dumps(order)
-        )
-        response.raise_for_status()
-        
-        # Parse response
-        root = ET.fromstring(response.text)
-        preview_id = root.find('.//previewId').text
-        
-        return {
-            "status": "success",
-            "previewId": preview_id,
-            "clientOrderId": order["PreviewOrderRequest"]["clientOrderId"],
-            "message": "Call etrade_place_order with this previewId to execute.",
-        }
-    except Exception as e:
-        return {"status": "error", "error": str(e)}
+    response = await get_http_client().post(
+        url,
+        headers=ORDER_HEADERS,
+        content=build_order_body("PreviewOrderRequest", order)
+    )
+    response.raise_for_status()
+    
+    body = orjson.loads(response.content)["PreviewOrderResponse"]
+    preview_id = str(body["PreviewIds"][0]["previewId"])
+    
+    return {
+        "status": "success",
+        "previewId": preview_id,
+        "clientOrderId": order["clientOrderId"],
+        "message": "Call etrade_place_order with this previewId to execute.",
+    }
 
 
 @server.tool()
-def etrade_place_order(
+@etrade_tool
+async def etrade_place_order(
     account_id_key: str,
     preview_id: str,
     client_order_id: str,
@@ -452,86 +605,61 @@ def etrade_place_order(
         stop_price: For STOP orders or TRAILING_STOP_PRCT percentage
         order_term: GOOD_FOR_DAY or GOOD_UNTIL_CANCEL
     """
-    logger.info(f"Tool: etrade_place_order({symbol} {action} {quantity})")
+    logger.info("Tool: etrade_place_order(%s %s %s)", symbol, action, quantity)
     
-    auth_err = ensure_auth()
-    if auth_err:
-        return auth_err
+    url = f"{BASE_URL}/accounts/{account_id_key}/orders/place"
+    order = {
+        "clientOrderId": client_order_id,
+        "symbol": symbol,
+        "action": action,
+        "quantity": quantity,
+        "priceType": price_type,
+        "orderTerm": order_term,
+        "limitPrice": limit_price,
+        "stopPrice": stop_price,
+    }
+    order = normalize_order(order)
+    error = validate_order(order)
+    if error:
+        return {"status": "error", "error": error}
     
-    try:
-        url = f"{get_base_url()}/accounts/{account_id_key}/orders/place"
-        
-        order = {
-            "PlaceOrderRequest": {
-                "orderType": "EQ",
-                "clientOrderId": client_order_id,
-                "PreviewIds": [{"previewId": preview_id}],
-                "Order": [{
-                    "allOrNone": "false",
-                    "priceType": price_type,
-                    "orderTerm": order_term,
-                    "marketSession": "REGULAR",
-                    "Instrument": [{
-                        "Product": {"securityType": "EQ", "symbol": symbol},
-                        "orderAction": action,
-                        "quantityType": "QUANTITY",
-                        "quantity": str(quantity),
-                    }]
-                }]
-            }
-        }
-        
-        if limit_price:
-            order["PlaceOrderRequest"]["Order"][0]["limitPrice"] = str(limit_price)
-        if stop_price:
-            order["PlaceOrderRequest"]["Order"][0]["stopPrice"] = str(stop_price)
-        
-        response = oauth_manager.session.post(
-            url,
-            headers={"Content-Type": "application/json"},
-            data=json.dumps(order)
-        )
-        response.raise_for_status()
-        
-        # Parse response
-        root = ET.fromstring(response.text)
-        order_id = root.find('.//orderId').text
-        
-        return {
-            "status": "success",
-            "orderId": order_id,
-            "message": f"Order {order_id} placed successfully.",
-        }
-    except Exception as e:
-        return {"status": "error", "error": str(e)}
+    response = await get_http_client().post(
+        url,
+        headers=ORDER_HEADERS,
+        content=build_order_body("PlaceOrderRequest", order, preview_id)
+    )
+    response.raise_for_status()
+    
+    body = orjson.loads(response.content)["PlaceOrderResponse"]
+    order_id = str(body["OrderIds"][0]["orderId"])
+    
+    return {
+        "status": "success",
+        "orderId": order_id,
+        "message": f"Order {order_id} placed successfully.",
+    }
 
 
 @server.tool()
-def etrade_cancel_order(account_id_key: str, order_id: str) -> dict:
+@etrade_tool
+async def etrade_cancel_order(account_id_key: str, order_id: str) -> dict:
     """Cancel an open order.
     
     Args:
         account_id_key: Account ID key
         order_id: Order ID to cancel
     """
-    logger.info(f"Tool: etrade_cancel_order({order_id})")
+    logger.info("Tool: etrade_cancel_order(%s)", order_id)
     
-    auth_err = ensure_auth()
-    if auth_err:
-        return auth_err
+    url = f"{BASE_URL}/accounts/{account_id_key}/orders/cancel"
+    response = await get_http_client().put(
+        url,
+        headers=ORDER_HEADERS,
+        content=build_cancel_body(order_id)
+    )
+    response.raise_for_status()
     
-    try:
-        url = f"{get_base_url()}/accounts/{account_id_key}/orders/cancel"
-        response = oauth_manager.session.put(
-            url,
-            headers={"Content-Type": "application/json"},
-            data=json.dumps({"CancelOrderRequest": {"orderId": order_id}})
-        )
-        response.raise_for_status()
-        
-        return {"status": "success", "orderId": order_id, "message": "Order cancelled."}
-    except Exception as e:
-        return {"status": "error", "error": str(e)}
+    return {"status": "success", "orderId": order_id, "message": "Order cancelled."}
 
 
 def main():
@@ -60,7 +60,8 @@ try:
     print(f"✅ Access token: {access['oauth_token'][:30]}...\n")
     
     # Test accounts
-    from api.etrade_client import etrade_client
+    from api.etrade_client import get_etrade_client
+    etrade_client = get_etrade_client()
     etrade_client.oauth.resource_owner_key = access['oauth_token']
     etrade_client.oauth.resource_owner_secret = access['oauth_token_secret']
     
@@ -11,7 +11,7 @@ This script simulates the OAuth flow:
 
 import sys
 from api.oauth import oauth_manager
-from api.etrade_client import etrade_client
+from api.etrade_client import get_etrade_client
 
 def main():
     print("=" * 70)
@@ -66,7 +66,7 @@ def main():
             print("❌ Not authenticated")
             return False
         
-        accounts_list = etrade_client.accounts.get_account_list()
+        accounts_list = get_etrade_client().accounts.get_account_list()
         print(f"✅ SUCCESS - Retrieved accounts!")
         print(f"\n   Accounts Response:")
         print(f"   {accounts_list}")
@@ -1,8 +1,28 @@
 """Tests for FastAPI application."""
 
+import asyncio
+import gzip
+
+import httpx
+import orjson
 import pytest
 from fastapi.testclient import TestClient
-from api.main import app
+from starlette.requests import Request
+from api.main import (
+    accepts_encoding,
+    accounts_cache,
+    app,
+    body_etag,
+    build_order_body,
+    etag_matches,
+    fetch_quote_batch,
+    fetch_quotes,
+    ndjson_response,
+    quote_cache,
+    require_auth,
+    revalidating_get,
+    stream_upstream,
+)
 
 
 @pytest.fixture
@@ -153,3 +173,359 @@ def test_orders_cancel_endpoint_exists(client):
     """Test cancel order endpoint exists."""
     response = client.put("/orders/test-account-key/cancel?order_id=123")
     assert response.status_code != 404
+
+
+def test_quotes_fetch_only_uncached_symbols():
+    """Test overlapping quote requests only fetch symbols not yet cached."""
+    requested = []
+
+    def handler(request):
+        symbols = request.url.path.rsplit("/", 1)[-1].split(",")
+        requested.append(symbols)
+        quotes = "".join(
+            f"<QuoteData><Product><symbol>{s}</symbol></Product></QuoteData>"
+            for s in symbols
+        )
+        return httpx.Response(200, content=f"<QuoteResponse>{quotes}</QuoteResponse>")
+
+    async def fetch_twice():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            await fetch_quotes(http, "AAPL,MSFT", "ALL")
+            return await fetch_quotes(http, "msft,GOOG", "ALL")
+
+    quote_cache.clear()
+    quotes, _ = asyncio.run(fetch_twice())
+    assert requested == [["AAPL", "MSFT"], ["GOOG"]]
+    assert [q["Product"]["symbol"] for q in quotes] == ["MSFT", "GOOG"]
+
+
+def test_ndjson_stream_reports_midway_failure():
+    """Test a failure after streaming starts ends with an error line."""
+    async def lines():
+        yield {"status": "success", "account_count": 2}
+        raise RuntimeError("upstream went away")
+
+    async def collect():
+        response = ndjson_response(lines())
+        return [chunk async for chunk in response.body_iterator]
+
+    chunks = asyncio.run(collect())
+    assert chunks[0] == b'{"status":"success","account_count":2}\n'
+    assert b'"status":"error"' in chunks[-1]
+
+
+def test_summary_isolates_an_unparseable_account(client):
+    """Test one account's malformed body becomes its own error line."""
+    def handler(request):
+        path = request.url.path
+        if path.endswith("/accounts/list"):
+            return httpx.Response(200, content=(
+                b"<AccountListResponse><Accounts>"
+                b"<Account><accountIdKey>good</accountIdKey><accountDesc>A</accountDesc></Account>"
+                b"<Account><accountIdKey>bad</accountIdKey><accountDesc>B</accountDesc></Account>"
+                b"</Accounts></AccountListResponse>"
+            ))
+        if "/bad/" in path:
+            return httpx.Response(200, content=b"<html>maintenance")
+        if path.endswith("/balance"):
+            return httpx.Response(200, content=(
+                b"<BalanceResponse><Computed><cashAvailableForInvestment/>"
+                b"</Computed></BalanceResponse>"
+            ))
+        return httpx.Response(200, content=(
+            b"<PortfolioResponse><Position><marketValue>100</marketValue>"
+            b"</Position></PortfolioResponse>"
+        ))
+
+    accounts_cache.clear()
+    app.dependency_overrides[require_auth] = lambda: None
+    app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        response = client.get("/summary")
+    finally:
+        app.dependency_overrides.clear()
+        del app.state.http
+        accounts_cache.clear()
+
+    lines = {}
+    for line in response.text.splitlines()[1:]:
+        data = orjson.loads(line)
+        lines[data["account"]["accountIdKey"] if "account" in data else "totals"] = data
+    assert "error" in lines["bad"]
+    assert lines["good"]["cash"] == 0
+    assert lines["totals"]["totals"]["portfolioValue"] == 100.0
+
+
+def test_etag_matches_if_none_match():
+    """Test If-None-Match matching accepts lists and weak validators."""
+    etag = body_etag(b"<AccountListResponse/>")
+
+    def request(value):
+        return Request({"type": "http", "headers": [(b"if-none-match", value.encode())]})
+
+    assert etag_matches(request(f'"other", W/{etag}'), etag)
+    assert not etag_matches(request('"other"'), etag)
+
+
+def test_concurrent_quote_misses_share_one_upstream_call():
+    """Test quote misses from concurrent callers are batched together."""
+    requested = []
+
+    def handler(request):
+        symbols = request.url.path.rsplit("/", 1)[-1].split(",")
+        requested.append(sorted(symbols))
+        quotes = "".join(
+            f"<QuoteData><Product><symbol>{s}</symbol></Product></QuoteData>"
+            for s in symbols
+        )
+        return httpx.Response(200, content=f"<QuoteResponse>{quotes}</QuoteResponse>")
+
+    async def fetch_concurrently():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            return await asyncio.gather(
+                fetch_quotes(http, "AAPL", "INTRADAY"),
+                fetch_quotes(http, "MSFT,AAPL", "INTRADAY"),
+            )
+
+    quote_cache.clear()
+    (first, _), (second, _) = asyncio.run(fetch_concurrently())
+    assert requested == [["AAPL", "MSFT"]]
+    assert [q["Product"]["symbol"] for q in second] == ["MSFT", "AAPL"]
+
+
+def test_quote_batches_are_split_at_the_symbol_limit():
+    """Test a batch over QUOTE_MAX_SYMBOLS goes upstream in several calls."""
+    requested = []
+
+    def handler(request):
+        symbols = request.url.path.rsplit("/", 1)[-1].split(",")
+        requested.append(len(symbols))
+        quotes = "".join(
+            f"<QuoteData><Product><symbol>{s}</symbol></Product></QuoteData>"
+            for s in symbols
+        )
+        return httpx.Response(200, content=f"<QuoteResponse>{quotes}</QuoteResponse>")
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            return await fetch_quote_batch(http, symbols, "ALL")
+
+    symbols = [f"S{i}" for i in range(60)]
+    quotes, _ = asyncio.run(fetch())
+    assert sorted(requested) == [10, 25, 25]
+    assert [q["Product"]["symbol"] for q in quotes] == symbols
+
+
+def test_quote_without_symbol_does_not_stall_the_batch():
+    """Test a QuoteData with no Product/symbol is skipped, not fatal to the batch."""
+    def handler(request):
+        return httpx.Response(200, content=(
+            b"<QuoteResponse><QuoteData><dateTime/></QuoteData>"
+            b"<QuoteData><Product><symbol>IBM</symbol></Product></QuoteData>"
+            b"</QuoteResponse>"
+        ))
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            return await asyncio.wait_for(fetch_quotes(http, "IBM,XYZ", "WEEK_52"), 1)
+
+    quote_cache.clear()
+    quotes, _ = asyncio.run(fetch())
+    assert [q["Product"]["symbol"] for q in quotes] == ["IBM"]
+
+
+def test_option_quotes_are_returned_despite_underlier_symbol():
+    """Test option quotes reporting the underlier symbol still come back."""
+    requested = []
+
+    def handler(request):
+        requested.append(request.url.path.rsplit("/", 1)[-1])
+        return httpx.Response(200, content=(
+            b"<QuoteResponse><QuoteData><Product><symbol>AAPL</symbol>"
+            b"<callPut>CALL</callPut><strikePrice>150</strikePrice></Product>"
+            b"</QuoteData></QuoteResponse>"
+        ))
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            return await asyncio.wait_for(
+                fetch_quotes(http, "AAPL:2025:1:17:CALL:150", "OPTIONS"), 1
+            )
+
+    quote_cache.clear()
+    quotes, _ = asyncio.run(fetch())
+    assert requested == ["AAPL:2025:1:17:CALL:150"]
+    assert [q["Product"]["callPut"] for q in quotes] == ["CALL"]
+    assert not quote_cache
+
+
+def relay_gzip_body(accept_encoding):
+    """Relay a gzip XML body through stream_upstream; return (response, body, sent)."""
+    body = gzip.compress(b"<OrdersResponse/>", mtime=0)
+    sent = []
+
+    class Body(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield body
+
+    def handler(request):
+        sent.append(request.headers["accept-encoding"])
+        headers = {"Content-Type": "application/xml", "Content-Encoding": "gzip"}
+        return httpx.Response(200, headers=headers, stream=Body())
+
+    async def relay():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            response = await stream_upstream(
+                http, "GET", "https://example.test/orders", accept_encoding=accept_encoding
+            )
+            chunks = [chunk async for chunk in response.body_iterator]
+            await response.background()
+            return response, b"".join(chunks)
+
+    response, relayed = asyncio.run(relay())
+    return response, relayed, sent
+
+
+def test_stream_upstream_relays_encoded_body():
+    """Test upstream bodies are relayed still compressed, with their encoding."""
+    response, relayed, sent = relay_gzip_body("gzip, br")
+    assert sent == ["gzip, br"]
+    assert relayed == gzip.compress(b"<OrdersResponse/>", mtime=0)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.media_type == "application/xml"
+
+
+def test_stream_upstream_decodes_for_identity_clients():
+    """Test a caller without Accept-Encoding gets a decoded body."""
+    response, relayed, sent = relay_gzip_body(None)
+    assert sent == ["identity"]
+    assert relayed == b"<OrdersResponse/>"
+    assert "content-encoding" not in response.headers
+
+
+def test_accepts_encoding_skips_malformed_quality():
+    """Test an unparseable q-value refuses the encoding instead of raising."""
+    assert not accepts_encoding("gzip;q=x", "gzip")
+    assert accepts_encoding("br, gzip;q=0.5", "gzip")
+
+
+def test_build_order_body_place_request():
+    """Test place bodies carry the preview ID and optional prices."""
+    order = {"symbol": "AAPL", "action": "BUY", "quantity": 10, "limitPrice": 150.0}
+    body = orjson.loads(build_order_body("PlaceOrderRequest", order, "123"))
+
+    request = body["PlaceOrderRequest"]
+    assert request["PreviewIds"] == [{"previewId": "123"}]
+    assert request["Order"][0]["limitPrice"] == 150.0
+    assert "stopPrice" not in request["Order"][0]
+    assert request["Order"][0]["Instrument"][0]["quantity"] == 10
+
+
+def test_client_order_ids_carry_the_process_and_fit_the_limit():
+    """Test clientOrderIds are unique, pid-tagged and at most 20 characters."""
+    import os
+
+    from api.orders import next_client_order_id
+
+    first, second = next_client_order_id("mcp-"), next_client_order_id("mcp-")
+    assert first != second
+    assert first.startswith(f"mcp-{os.getpid() % 1000:03d}")
+    assert len(first) <= 20
+
+
+def test_validate_order_rejects_local_mistakes():
+    """Test orders E*TRADE would refuse are caught before any request."""
+    from api.orders import validate_order
+
+    order = {"symbol": "BRK.B", "action": "BUY", "quantity": 10}
+    assert validate_order(order) is None
+    assert validate_order({**order, "quantity": 0})
+    assert validate_order({**order, "action": "HOLD"})
+    assert validate_order({**order, "priceType": "LIMIT"})
+    assert validate_order({**order, "priceType": "LIMIT", "limitPrice": 150.0}) is None
+    assert validate_order({**order, "symbol": "AAPL; DROP"})
+
+
+def test_preview_normalizes_the_order_before_validating(client):
+    """Test string quantities and lower-case fields are accepted and sent upper-cased."""
+    sent = []
+
+    def handler(request):
+        sent.append(orjson.loads(request.content))
+        return httpx.Response(200, content=b"{}")
+
+    app.dependency_overrides[require_auth] = lambda: None
+    app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        preview = client.post(
+            "/orders/test-account-key/preview",
+            json={"symbol": "aapl", "action": "buy", "quantity": "10"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+        del app.state.http
+
+    assert preview.status_code == 200
+    instrument = sent[0]["PreviewOrderRequest"]["Order"][0]["Instrument"][0]
+    assert instrument["Product"]["symbol"] == "AAPL"
+    assert instrument["orderAction"] == "BUY"
+    assert instrument["quantity"] == 10
+
+
+def test_upstream_error_status_is_relayed(client):
+    """Test E*TRADE 4xx errors keep their status and 5xx become 502."""
+    def handler(request):
+        status = 401 if "orders" in request.url.path else 503
+        return httpx.Response(status, content=b"<Error/>")
+
+    app.dependency_overrides[require_auth] = lambda: None
+    app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        orders = client.get("/orders/test-account-key")
+        expiry = client.get("/market/optionexpiredate?symbol=AAPL")
+    finally:
+        app.dependency_overrides.clear()
+        del app.state.http
+
+    assert orders.status_code == 401
+    assert orders.json() == {"status": "error", "error": "E*TRADE returned 401 Unauthorized"}
+    assert expiry.status_code == 502
+
+
+def test_failures_outside_httpx_keep_the_error_envelope(client):
+    """Test bad orders get 422 and unparseable E*TRADE bodies 502, as JSON."""
+    def handler(request):
+        return httpx.Response(200, content=b"<html>maintenance")
+
+    app.dependency_overrides[require_auth] = lambda: None
+    app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        preview = client.post("/orders/test-account-key/preview", json={"action": "BUY"})
+        balance = client.get("/accounts/test-account-key/balance")
+    finally:
+        app.dependency_overrides.clear()
+        del app.state.http
+
+    assert preview.status_code == 422
+    assert preview.json()["status"] == "error"
+    assert balance.status_code == 502
+    assert balance.json()["status"] == "error"
+
+
+def test_revalidating_get_reuses_body_on_304():
+    """Test a repeat fetch sends If-None-Match and reuses the stored body."""
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": '"v1"'}, content=b"<PortfolioResponse/>")
+
+    async def fetch_twice():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            url = "https://example.test/accounts/k/portfolio"
+            return [await revalidating_get(http, url) for _ in range(2)]
+
+    assert asyncio.run(fetch_twice()) == [b"<PortfolioResponse/>"] * 2
+    assert seen == [None, '"v1"']
@@ -0,0 +1,48 @@
+"""Tests for the async TTL cache."""
+
+import asyncio
+
+from api.cache import AsyncTTLCache
+
+
+def test_concurrent_misses_share_one_fetch():
+    """Test concurrent callers for one key trigger a single fetch."""
+    cache = AsyncTTLCache(maxsize=8, ttl=30)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b"accounts"
+
+    async def run():
+        return await asyncio.gather(*(
+            cache.get_or_fetch("accounts", fetch) for _ in range(5)
+        ))
+
+    assert asyncio.run(run()) == [b"accounts"] * 5
+    assert len(calls) == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["shared"] == 4
+
+
+def test_failed_fetch_is_shared_and_not_cached():
+    """Test concurrent callers share one failure and the next call retries."""
+    cache = AsyncTTLCache(maxsize=8, ttl=30)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream error")
+
+    async def run():
+        return await asyncio.gather(*(
+            cache.get_or_fetch("accounts", fetch) for _ in range(3)
+        ), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert len(calls) == 1
+    asyncio.run(run())
+    assert len(calls) == 2
@@ -1,8 +1,12 @@
 """Tests for MCP server."""
 
+import asyncio
 import pytest
 import os
-import sys
+
+import httpx
+import orjson
+from lxml import etree
 
 
 def test_mcp_server_module_exists():
@@ -22,3 +26,127 @@ def test_mcp_server_file_exists():
     server_file = os.path.join(project_root, 'mcp_server', 'server.py')
     
     assert os.path.exists(server_file), f"MCP server file not found at {server_file}"
+
+
+def test_quote_key_normalizes_symbol_lists():
+    """Test differently written symbol lists share one quote cache key."""
+    from mcp_server.server import quote_key
+
+    assert quote_key("msft, AAPL") == quote_key("AAPL,MSFT,") == "AAPL,MSFT"
+
+
+def test_order_dict_reads_each_field_or_none():
+    """Test an Order element becomes its fields, with None for missing ones."""
+    from mcp_server.server import order_dict
+
+    order = etree.fromstring(
+        b"<Order><orderId>9</orderId><orderType>EQ</orderType><OrderDetail>"
+        b"<status>OPEN</status><Instrument><Product><symbol>AAPL</symbol></Product>"
+        b"<orderedQuantity>5</orderedQuantity></Instrument></OrderDetail></Order>"
+    )
+    row = order_dict(order)
+    assert row == {
+        "orderId": "9",
+        "orderType": "EQ",
+        "status": "OPEN",
+        "symbol": "AAPL",
+        "quantity": "5",
+        "priceType": None,
+    }
+    assert row["status"] is order_dict(order)["status"]
+
+
+def test_etrade_tool_renews_and_replays_once_after_401(monkeypatch):
+    """Test a 401 renews the token once and the tool call is replayed."""
+    from mcp_server import server
+
+    async def authenticated():
+        return True
+
+    renewals = []
+
+    def renew(since):
+        renewals.append(since)
+        return True
+
+    monkeypatch.setattr(server.oauth_manager, "ensure_authenticated_cached", authenticated)
+    monkeypatch.setattr(server.oauth_manager, "renew_rejected", renew)
+    calls = []
+
+    @server.etrade_tool
+    async def tool():
+        calls.append(1)
+        if len(calls) == 1:
+            request = httpx.Request("GET", "https://api.etrade.com/v1/accounts/list")
+            raise httpx.HTTPStatusError("401", request=request, response=httpx.Response(401))
+        return {"status": "success"}
+
+    assert asyncio.run(tool()).structured_content == {"status": "success"}
+    assert len(calls) == 2
+    assert len(renewals) == 1
+
+
+def test_preview_order_tool_normalizes_lower_case_input(monkeypatch):
+    """Test the MCP preview accepts lower-case fields and sends them upper-cased."""
+    from mcp_server import server
+
+    async def authenticated():
+        return True
+
+    sent = []
+
+    def handler(request):
+        sent.append(orjson.loads(request.content))
+        return httpx.Response(200, json={
+            "PreviewOrderResponse": {"PreviewIds": [{"previewId": 7}]},
+        })
+
+    monkeypatch.setattr(server.oauth_manager, "ensure_authenticated_cached", authenticated)
+    monkeypatch.setattr(
+        server, "get_http_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    result = asyncio.run(server.etrade_preview_order(
+        "key", "aapl", "buy", 10, price_type="limit", limit_price=150.0,
+    ))
+    assert result.structured_content["previewId"] == "7"
+    details = sent[0]["PreviewOrderRequest"]["Order"][0]
+    assert details["priceType"] == "LIMIT"
+    assert details["Instrument"][0]["orderAction"] == "BUY"
+    assert details["Instrument"][0]["Product"]["symbol"] == "AAPL"
+
+
+def test_summary_tool_reports_a_failed_account_without_failing(monkeypatch):
+    """Test one account's failed request is an error entry, not a failed summary."""
+    from mcp_server import server
+
+    async def authenticated():
+        return True
+
+    def handler(request):
+        if "/bad/" in request.url.path:
+            return httpx.Response(500)
+        if request.url.path.endswith("/balance"):
+            return httpx.Response(200, content=(
+                b"<BalanceResponse><Computed><cashAvailableForInvestment>10"
+                b"</cashAvailableForInvestment></Computed></BalanceResponse>"
+            ))
+        return httpx.Response(200, content=b"<PortfolioResponse/>")
+
+    accounts = [
+        {"accountIdKey": key, "accountDesc": key, "accountType": "INDIVIDUAL"}
+        for key in ("good", "bad")
+    ]
+    monkeypatch.setattr(server.oauth_manager, "ensure_authenticated_cached", authenticated)
+    monkeypatch.setattr(server, "fetch_accounts", lambda: accounts)
+    monkeypatch.setattr(
+        server, "get_http_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    result = asyncio.run(server.etrade_get_summary()).structured_content
+    assert result["status"] == "success"
+    assert result["accounts"][0]["cash"] == 10.0
+    assert result["accounts"][1]["error"].startswith("E*TRADE returned 500")
+    assert result["totals"]["cash"] == 10.0
@@ -0,0 +1,132 @@
+"""Tests for OAuth token handling."""
+
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+
+from api import oauth
+from api.http_client import OAuth1Auth
+
+
+def test_routine_checks_do_not_rewrite_token_file(tmp_path, monkeypatch):
+    """Test ensure_authenticated() saves once, then only after PERSIST_INTERVAL."""
+    token_file = tmp_path / "tokens.json"
+    monkeypatch.setattr(oauth, "TOKEN_FILE", token_file)
+
+    manager = oauth.OAuthManager()
+    manager.access_token = manager.access_token_secret = "token"
+    manager.session = object()
+    manager.token_date = manager._get_eastern_date()
+    manager._last_used_epoch = time.time()
+
+    assert manager.ensure_authenticated()
+    first_write = token_file.stat().st_mtime_ns
+    assert manager.ensure_authenticated()
+
+    assert token_file.stat().st_mtime_ns == first_write
+    assert json.loads(token_file.read_text())["access_token"] == "token"
+    assert list(tmp_path.iterdir()) == [token_file]
+    assert token_file.stat().st_mode & 0o777 == 0o600
+
+
+def test_overlapping_saves_use_separate_temp_files(tmp_path, monkeypatch, caplog):
+    """Test managers saving at the same time never share a temp file."""
+    token_file = tmp_path / "tokens.json"
+    monkeypatch.setattr(oauth, "TOKEN_FILE", token_file)
+
+    managers = [oauth.OAuthManager() for _ in range(8)]
+    for manager in managers:
+        manager.access_token = manager.access_token_secret = "token"
+    threads = [threading.Thread(target=m._save_tokens) for m in managers for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert "Failed to save tokens" not in caplog.text
+    assert list(tmp_path.iterdir()) == [token_file]
+    assert json.loads(token_file.read_text())["access_token"] == "token"
+
+
+def test_tokens_saved_by_another_process_are_picked_up(tmp_path, monkeypatch):
+    """Test a logged-out manager loads tokens once another one saves them."""
+    monkeypatch.setattr(oauth, "TOKEN_FILE", tmp_path / "tokens.json")
+
+    reader = oauth.OAuthManager()
+    assert not reader.ensure_authenticated()
+
+    writer = oauth.OAuthManager()
+    writer.access_token = writer.access_token_secret = "token"
+    writer._save_tokens()
+
+    assert reader.ensure_authenticated()
+    assert reader.access_token == "token"
+
+
+def test_concurrent_checks_renew_an_idle_token_once(tmp_path, monkeypatch):
+    """Test threads finding the token idle together send a single renewal."""
+    monkeypatch.setattr(oauth, "TOKEN_FILE", tmp_path / "tokens.json")
+
+    manager = oauth.OAuthManager()
+    manager.access_token = manager.access_token_secret = "token"
+    manager.session = object()
+    manager.token_date = manager._get_eastern_date()
+    manager._last_used_epoch = time.time() - 3 * 60 * 60
+    renewals = []
+
+    def renew():
+        renewals.append(1)
+        time.sleep(0.05)
+        manager._last_used_epoch = time.time()
+        return True
+
+    monkeypatch.setattr(manager, "_renew_token", renew)
+    threads = [threading.Thread(target=manager.ensure_authenticated) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(renewals) == 1
+
+
+def test_calls_rejected_before_a_renewal_reuse_it(tmp_path, monkeypatch):
+    """Test renew_rejected() skips renewing when one followed the call."""
+    monkeypatch.setattr(oauth, "TOKEN_FILE", tmp_path / "tokens.json")
+
+    manager = oauth.OAuthManager()
+    renewals = []
+
+    def renew():
+        renewals.append(1)
+        return True
+
+    monkeypatch.setattr(manager, "_renew_token", renew)
+
+    started = time.time()
+    manager._renewed_at = started + 1
+    assert manager.renew_rejected(started)
+    assert not renewals
+
+    assert manager.renew_rejected(started + 2)
+    assert renewals == [1]
+
+
+def test_401_response_drops_the_cached_auth_check(tmp_path, monkeypatch):
+    """Test a 401 signed by OAuth1Auth makes the next call re-check the token."""
+    monkeypatch.setattr(oauth, "TOKEN_FILE", tmp_path / "tokens.json")
+
+    manager = oauth.OAuthManager()
+    manager.access_token = manager.access_token_secret = "token"
+    manager._auth_valid_until = time.monotonic() + oauth.AUTH_CHECK_TTL
+
+    async def call():
+        transport = httpx.MockTransport(lambda request: httpx.Response(401))
+        async with httpx.AsyncClient(auth=OAuth1Auth(manager), transport=transport) as http:
+            return await http.get("https://api.etrade.com/v1/accounts/list")
+
+    assert asyncio.run(call()).status_code == 401
+    assert manager._auth_valid_until == 0.0
@@ -0,0 +1,148 @@
+"""Tests for E*TRADE XML parsers."""
+
+import io
+
+from lxml import etree
+
+from api.parsers import (
+    XML_PARSER,
+    PositionsFeed,
+    iter_elements,
+    parse_accounts_xml,
+    parse_balance_xml,
+    parse_cash_xml,
+    parse_lookup_xml,
+    parse_option_chains_xml,
+    parse_option_expire_dates_xml,
+    parse_position_summaries_xml,
+    parse_positions_xml,
+    parse_quotes_xml,
+)
+
+ACCOUNTS_XML = b"""<AccountListResponse><Accounts>
+<Account><accountId>1</accountId><accountIdKey>key1</accountIdKey><accountDesc>Brokerage</accountDesc><accountType>INDIVIDUAL</accountType></Account>
+<Account><accountId>2</accountId><accountIdKey>key2</accountIdKey><accountDesc>IRA</accountDesc><accountType>IRA</accountType></Account>
+</Accounts></AccountListResponse>"""
+
+BALANCE_XML = b"""<BalanceResponse><accountId>1</accountId>
+<Computed><cashAvailableForInvestment>1500.25</cashAvailableForInvestment>
+<RealTimeValues><totalAccountValue>9000</totalAccountValue></RealTimeValues></Computed>
+</BalanceResponse>"""
+
+PORTFOLIO_XML = b"""<PortfolioResponse><AccountPortfolio>
+<Position><Product><symbol>AAPL</symbol></Product><quantity>10</quantity>
+<Quick><lastTrade>150.5</lastTrade></Quick><marketValue>1505</marketValue>
+<totalGain>105</totalGain><totalGainPct>7.5</totalGainPct></Position>
+<Position><Product><symbol>MSFT</symbol></Product><quantity>2</quantity>
+<marketValue>600</marketValue><totalGain>-20</totalGain><totalGainPct>-3.2</totalGainPct></Position>
+</AccountPortfolio></PortfolioResponse>"""
+
+QUOTES_XML = b"""<QuoteResponse>
+<QuoteData><Product><symbol>AAPL</symbol></Product><All><lastTrade>150.5</lastTrade></All></QuoteData>
+<Messages><Message><description>Invalid symbol XYZ</description><code>1019</code></Message></Messages>
+</QuoteResponse>"""
+
+
+def test_xml_parser_does_not_expand_entities():
+    """Test E*TRADE bodies are parsed without expanding declared entities."""
+    root = etree.fromstring(
+        b'<?xml version="1.0"?><!DOCTYPE d [<!ENTITY e "boom">]><d>&e;</d>', XML_PARSER
+    )
+    # The reference is kept as an entity node, never turned into text
+    assert root.text is None
+
+
+def test_parse_accounts_xml():
+    """Test every account is returned with all of its fields."""
+    accounts = parse_accounts_xml(ACCOUNTS_XML)
+    assert [a["accountIdKey"] for a in accounts] == ["key1", "key2"]
+    assert accounts[1]["accountType"] == "IRA"
+
+
+def test_parse_balance_xml():
+    """Test balance bodies convert to nested dicts."""
+    balance = parse_balance_xml(BALANCE_XML)
+    assert balance["Computed"]["RealTimeValues"]["totalAccountValue"] == "9000"
+    assert parse_cash_xml(BALANCE_XML) == 1500.25
+
+
+def test_parse_positions_xml():
+    """Test positions keep every E*TRADE field."""
+    positions = parse_positions_xml(PORTFOLIO_XML)
+    assert positions[0]["Product"] == {"symbol": "AAPL"}
+    assert positions[0]["Quick"] == {"lastTrade": "150.5"}
+    assert positions[1]["totalGainPct"] == "-3.2"
+
+
+def test_parse_position_summaries_xml():
+    """Test summaries are typed and a missing lastTrade defaults to 0."""
+    positions = parse_position_summaries_xml(PORTFOLIO_XML)
+    assert positions[0] == {
+        "symbol": "AAPL",
+        "quantity": 10.0,
+        "price": 150.5,
+        "marketValue": 1505.0,
+        "gain": 105.0,
+        "gainPct": 7.5,
+    }
+    assert positions[1]["price"] == 0
+
+
+def test_position_summary_defaults_missing_numbers():
+    """Test a missing or empty number becomes 0 instead of raising."""
+    positions = parse_position_summaries_xml(
+        b"<PortfolioResponse><Position><Product><symbol>IBM</symbol></Product>"
+        b"<quantity></quantity><marketValue>50</marketValue></Position></PortfolioResponse>"
+    )
+    assert positions == [{
+        "symbol": "IBM",
+        "quantity": 0,
+        "price": 0,
+        "marketValue": 50.0,
+        "gain": 0,
+        "gainPct": 0,
+    }]
+
+
+def test_positions_feed_matches_whole_body_parse():
+    """Test feeding a body in small chunks parses the same positions."""
+    feed = PositionsFeed()
+    for start in range(0, len(PORTFOLIO_XML), 7):
+        feed.feed(PORTFOLIO_XML[start:start + 7])
+    assert feed.close() == parse_positions_xml(PORTFOLIO_XML)
+
+
+def test_iter_elements_reads_a_file_object():
+    """Test elements stream out of a file object the same as out of bytes."""
+    accounts = iter_elements(io.BytesIO(ACCOUNTS_XML), "Account")
+    ids = [account.findtext("accountId") for account in accounts]
+    assert ids == ["1", "2"]
+
+
+def test_parse_quotes_xml():
+    """Test quotes and messages are split apart."""
+    quotes, messages = parse_quotes_xml(QUOTES_XML)
+    assert quotes[0]["All"]["lastTrade"] == "150.5"
+    assert messages[0]["code"] == "1019"
+
+
+def test_parse_lookup_and_option_bodies():
+    """Test lookup, option chain and expiry bodies become JSON-ready values."""
+    lookup = parse_lookup_xml(
+        b"<LookupResponse><Data><symbol>AAPL</symbol><description>APPLE INC</description>"
+        b"<type>EQUITY</type></Data></LookupResponse>"
+    )
+    assert lookup == [{"symbol": "AAPL", "description": "APPLE INC", "type": "EQUITY"}]
+
+    chain = parse_option_chains_xml(
+        b"<OptionChainResponse><nearPrice>150.0</nearPrice><OptionPair><Call>"
+        b"<strikePrice>150</strikePrice></Call></OptionPair></OptionChainResponse>"
+    )
+    assert chain == {"nearPrice": "150.0", "OptionPair": [{"Call": {"strikePrice": "150"}}]}
+
+    dates = parse_option_expire_dates_xml(
+        b"<OptionExpireDateResponse><ExpirationDate><year>2026</year><month>11</month>"
+        b"<day>20</day><expiryType>MONTHLY</expiryType></ExpirationDate>"
+        b"</OptionExpireDateResponse>"
+    )
+    assert dates == [{"year": "2026", "month": "11", "day": "20", "expiryType": "MONTHLY"}]